@@ -0,0 +1,201 @@
+# ---------- Imports ----------
+import socket
+import struct
+import threading
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+# ---------- Status Codes ----------
+class Status(IntEnum):
+    SCANNING = 0
+    OFFLINE = 1
+    ONLINE = 2
+    DEGRADED = 3
+
+    @property
+    def label(self) -> str:
+        return _STATUS_LABELS[self]
+
+    @classmethod
+    def parse(cls, value) -> "Status":
+        if isinstance(value, Status):
+            return value
+        return _STATUS_BY_LABEL.get(str(value).lower().rstrip("…."), cls.SCANNING)
+
+_STATUS_LABELS = {
+    Status.SCANNING: "Scanning…",
+    Status.OFFLINE: "Offline",
+    Status.ONLINE: "Online",
+    Status.DEGRADED: "Degraded",
+}
+_STATUS_BY_LABEL = {label.lower().rstrip("…"): status for status, label in _STATUS_LABELS.items()}
+
+# ---------- Dirty Field Bits ----------
+F_MAC      = 1 << 0
+F_HOSTNAME = 1 << 1
+F_VENDOR   = 1 << 2
+F_STATUS   = 1 << 3
+F_PROTOCOL = 1 << 4
+F_PING     = 1 << 5
+F_LOSS     = 1 << 6
+F_JITTER   = 1 << 7
+F_RTT      = 1 << 8   # rtt_min / rtt_max / rtt_mdev
+F_SEEN     = 1 << 9   # first_seen / last_seen
+F_HISTORY  = 1 << 10
+F_ALL      = (1 << 11) - 1
+
+_FIELD_BITS = {
+    "mac_int": F_MAC, "hostname": F_HOSTNAME, "vendor": F_VENDOR, "status": F_STATUS,
+    "protocol": F_PROTOCOL, "ping": F_PING, "loss": F_LOSS, "jitter": F_JITTER,
+    "rtt_min": F_RTT, "rtt_max": F_RTT, "rtt_mdev": F_RTT,
+    "first_seen": F_SEEN, "last_seen": F_SEEN,
+}
+
+# Scans kept per host (the details pane shows the last 10)
+HISTORY_LEN = 100
+
+# ---------- Packing ----------
+def ip_to_int(ip: str) -> int:
+    # inet_pton, not inet_aton: "127.1" or "10.0.0.1 junk" must not pack
+    return struct.unpack("!I", socket.inet_pton(socket.AF_INET, ip))[0]
+
+def int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+def mac_to_int(mac: str) -> int:
+    # 0 stands for "unknown" (00:00:00:00:00:00 is never a real station)
+    digits = "".join(c for c in (mac or "") if c in "0123456789abcdefABCDEF")
+    return int(digits, 16) if len(digits) == 12 else 0
+
+def int_to_mac(value: int) -> str:
+    if not value:
+        return ""
+    h = "%012x" % value
+    return ":".join(h[i:i + 2] for i in range(0, 12, 2))
+
+# ---------- Device Record ----------
+class Device:
+    """One host. Attribute writes set bits in `dirty` so views redraw only what changed.
+
+    Also behaves like the old per-host dict (info["mac"], info.get("status"),
+    dict(info)), with status as its label string and ip/mac as text.
+    Keys that are not IPv4 literals (names typed into the watchlist, IPv6)
+    are kept unpacked in `host` and pinged by name.
+    """
+
+    __slots__ = (
+        "ip_int", "host", "mac_int", "hostname", "vendor", "status", "protocol",
+        "ping", "loss", "jitter", "rtt_min", "rtt_max", "rtt_mdev",
+        "first_seen", "last_seen", "history", "dirty",
+    )
+
+    # Ping threads and the Tk thread both mark fields; take_dirty must not lose a bit
+    _dirty_lock = threading.Lock()
+
+    def __init__(self, ip: str, mac: str = "", status: Status = Status.OFFLINE, hostname: str = ""):
+        set_ = object.__setattr__
+        try:
+            set_(self, "ip_int", ip_to_int(ip))
+            set_(self, "host", "")
+        except OSError:
+            set_(self, "ip_int", 0)
+            set_(self, "host", str(ip))
+        set_(self, "mac_int", mac_to_int(mac))
+        set_(self, "hostname", hostname)
+        set_(self, "vendor", "")
+        set_(self, "status", Status.parse(status))
+        set_(self, "protocol", "")
+        for name in ("ping", "loss", "jitter", "rtt_min", "rtt_max", "rtt_mdev", "first_seen", "last_seen"):
+            set_(self, name, None)
+        set_(self, "history", bytearray())  # one Status code per scan
+        set_(self, "dirty", F_ALL)
+
+    def __setattr__(self, name: str, value: Any):
+        bit = _FIELD_BITS.get(name)
+        if bit and getattr(self, name) == value:
+            return  # unchanged: nothing to redraw
+        object.__setattr__(self, name, value)
+        if bit:
+            self._mark(bit)
+
+    def _mark(self, bit: int):
+        with self._dirty_lock:
+            object.__setattr__(self, "dirty", self.dirty | bit)
+
+    # --- Text views of packed fields ---
+    @property
+    def ip(self) -> str:
+        return self.host or int_to_ip(self.ip_int)
+
+    @property
+    def mac(self) -> str:
+        return int_to_mac(self.mac_int)
+
+    @mac.setter
+    def mac(self, value: str):
+        self.mac_int = mac_to_int(value)
+
+    def record(self, status: Status):
+        self.status = status
+        self.history.append(status)
+        if len(self.history) > HISTORY_LEN:
+            del self.history[:-HISTORY_LEN]
+        self._mark(F_HISTORY)
+
+    def take_dirty(self) -> int:
+        with self._dirty_lock:
+            bits = self.dirty
+            object.__setattr__(self, "dirty", 0)
+        return bits
+
+    # --- Dict compatibility ---
+    _KEYS = ("ip", "mac", "hostname", "vendor", "status", "protocol", "ping", "loss", "jitter",
+             "rtt_min", "rtt_max", "rtt_mdev", "first_seen", "last_seen", "history")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "status":
+            return self.status.label
+        if key == "history":
+            return [Status(code).label for code in self.history]
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key == "status":
+            self.status = Status.parse(value)
+        elif key == "history":
+            self.history = bytearray(Status.parse(v) for v in value)[-HISTORY_LEN:]
+            self._mark(F_HISTORY)
+        elif key in self._KEYS and key != "ip":
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._KEYS
+
+    def items(self):
+        return [(k, self[k]) for k in self._KEYS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"Device({self.ip!r}, mac={self.mac!r}, status={self.status.label!r})"
+
+def make_device(ip: str, mac: str = "", status: Status = Status.OFFLINE, hostname: str = "") -> Optional[Device]:
+    # Blank keys are the only ones that cannot become a record
+    ip = str(ip).strip()
+    if not ip:
+        return None
+    return Device(ip, mac, status, hostname)
@@ -0,0 +1,394 @@
+# ---------- Imports ----------
+import bisect
+import json
+import mmap
+import os
+import queue
+import random
+import re
+import socket
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# ---------- Paths ----------
+DNS_CACHE_PATH = Path.home() / ".network-monitor-dns.json"
+OUI_SOURCE_PATH = Path(__file__).with_name("oui.txt")
+OUI_INDEX_PATH = Path.home() / ".network-monitor-oui.idx"
+RESOLV_CONF = Path("/etc/resolv.conf")
+
+# ---------- Tunables ----------
+POSITIVE_TTL = 3600.0   # seconds a resolved PTR name stays valid
+NEGATIVE_TTL = 300.0    # seconds a failed lookup is remembered
+DNS_TIMEOUT = 1.0
+DNS_WORKERS = 8
+
+# ---------- DNS Cache ----------
+class DnsCache:
+    """ip -> (hostname, expires_at); an empty hostname is a cached miss."""
+
+    def __init__(self, path: Optional[Path] = DNS_CACHE_PATH,
+                 positive_ttl: float = POSITIVE_TTL, negative_ttl: float = NEGATIVE_TTL):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def get(self, ip: str) -> Optional[str]:
+        # None means "unknown, resolve it"; "" means "known to have no name"
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return None
+            name, expires = entry
+            if expires < time.time():
+                del self._entries[ip]
+                self._dirty = True
+                return None
+            return name
+
+    def put(self, ip: str, name: Optional[str]):
+        ttl = self.positive_ttl if name else self.negative_ttl
+        with self._lock:
+            self._entries[ip] = (name or "", time.time() + ttl)
+            self._dirty = True
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return  # missing or malformed cache
+        now = time.time()
+        with self._lock:
+            for ip, entry in data.items():
+                try:
+                    name, expires = str(entry[0]), float(entry[1])
+                except Exception:
+                    continue
+                if expires >= now:
+                    self._entries[ip] = (name, expires)
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            data = {ip: [n, e] for ip, (n, e) in self._entries.items() if e >= now}
+            self._dirty = False
+        try:
+            _atomic_write(self.path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        except Exception:
+            pass
+
+def _atomic_write(target: Path, payload: bytes):
+    # Unique temp file per writer, so concurrent saves never share a partial file
+    fd, tmp = tempfile.mkstemp(prefix=target.name + ".", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, target)
+    except Exception:
+        try: os.unlink(tmp)
+        except OSError: pass
+        raise
+
+# ---------- PTR Queries ----------
+def _ptr_name(ip: str) -> str:
+    return ".".join(reversed(ip.split("."))) + ".in-addr.arpa"
+
+def _build_ptr_query(qid: int, ip: str) -> bytes:
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # RD, one question
+    qname = b"".join(
+        bytes([len(label)]) + label.encode("ascii") for label in _ptr_name(ip).split(".")
+    ) + b"\x00"
+    return header + qname + struct.pack("!HH", 12, 1)  # PTR, IN
+
+def _read_name(buf: bytes, offset: int) -> Tuple[str, int]:
+    labels = []
+    end = None
+    for _ in range(128):  # guards against compression loops
+        length = buf[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | buf[offset + 1]
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(buf[offset:offset + length].decode("ascii", "replace"))
+        offset += length
+    else:
+        raise ValueError("dns name too long")
+    return ".".join(labels), (end if end is not None else offset)
+
+def _parse_ptr_response(qid: int, buf: bytes) -> Optional[str]:
+    rid, flags, qdcount, ancount = struct.unpack_from("!HHHH", buf, 0)
+    if rid != qid:
+        raise ValueError("dns id mismatch")
+    if flags & 0x000F:
+        return None  # NXDOMAIN / SERVFAIL / ...
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(buf, offset)
+        offset += 4
+    for _ in range(ancount):
+        _, offset = _read_name(buf, offset)
+        rtype, _rclass, _ttl, rdlength = struct.unpack_from("!HHIH", buf, offset)
+        offset += 10
+        if rtype == 12:
+            name, _ = _read_name(buf, offset)
+            return name or None
+        offset += rdlength
+    return None
+
+def system_nameserver(path: Path = RESOLV_CONF) -> Optional[Tuple[str, int]]:
+    # First IPv4 nameserver from resolv.conf; None where there is none (Windows)
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2 or parts[0] != "nameserver":
+            continue
+        try:
+            socket.inet_pton(socket.AF_INET, parts[1])
+        except OSError:
+            continue
+        return (parts[1], 53)
+    return None
+
+def _gethostbyaddr(ip: str, timeout: float) -> Optional[str]:
+    # gethostbyaddr has no timeout of its own and can block for the whole
+    # resolver retry cycle; give up on it after `timeout` and let it finish alone
+    result = []
+
+    def run():
+        try:
+            result.append(socket.gethostbyaddr(ip)[0])
+        except Exception:
+            result.append(None)
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    t.join(timeout)
+    if not result:
+        raise socket.timeout("dns timeout")
+    return result[0]
+
+def resolve_ptr(ip: str, server: Optional[Tuple[str, int]] = None,
+                timeout: float = DNS_TIMEOUT) -> Optional[str]:
+    # Without an explicit server ask the system nameserver directly, so the
+    # timeout holds; only where none is configured use the system resolver
+    if server is None:
+        server = system_nameserver()
+    if server is None:
+        return _gethostbyaddr(ip, timeout)
+    qid = random.getrandbits(16)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        s.connect(server)
+        s.send(_build_ptr_query(qid, ip))
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("dns timeout")
+            s.settimeout(remaining)
+            buf = s.recv(4096)
+            try:
+                return _parse_ptr_response(qid, buf)
+            except (ValueError, IndexError, struct.error):
+                continue  # stray or truncated datagram
+
+# ---------- Async Reverse Resolver ----------
+class ReverseResolver:
+    """Bounded pool of resolver threads in front of a DnsCache."""
+
+    def __init__(self, cache: Optional[DnsCache] = None, server: Optional[Tuple[str, int]] = None,
+                 workers: int = DNS_WORKERS, timeout: float = DNS_TIMEOUT):
+        self.cache = cache if cache is not None else DnsCache()
+        self.server = server if server is not None else system_nameserver()
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._waiters: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def lookup(self, ip: str, callback: Optional[Callable[[str, str], None]] = None) -> Optional[str]:
+        # Cache hits answer synchronously; misses are queued and reported via callback
+        name = self.cache.get(ip)
+        if name is not None:
+            return name
+        with self._lock:
+            waiters = self._waiters.get(ip)
+            if waiters is None:
+                self._waiters[ip] = [callback] if callback else []
+                self._queue.put(ip)
+                self._start_workers()
+            elif callback:
+                waiters.append(callback)
+        return None
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self):
+        while True:
+            ip = self._queue.get()
+            try:
+                name = resolve_ptr(ip, self.server, self.timeout)
+            except Exception:
+                name = None
+            self.cache.put(ip, name)
+            with self._lock:
+                callbacks = self._waiters.pop(ip, [])
+                idle = not self._waiters
+            for cb in callbacks:
+                try:
+                    cb(ip, name or "")
+                except Exception:
+                    pass
+            if idle:
+                self.cache.save()
+
+# ---------- OUI Vendor Index ----------
+# Index layout: magic, record count, then sorted (oui:u32, name_offset:u32) records
+# followed by a NUL-separated vendor string table.
+OUI_MAGIC = b"NMOUI1\x00\x00"
+_OUI_HEADER = struct.Struct("!8sI")
+_OUI_RECORD = struct.Struct("!II")
+OUI_LINE = re.compile(
+    r"^(?P<oui>[0-9a-f]{2}-[0-9a-f]{2}-[0-9a-f]{2})\s+\(hex\)\s+(?P<vendor>\S.*?)\s*$",
+    re.IGNORECASE,
+)
+
+def build_oui_index(source: Path, target: Path):
+    vendors: Dict[int, str] = {}
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            m = OUI_LINE.match(line)
+            if m:
+                oui = int(re.sub(r"[-:]", "", m.group("oui")), 16)
+                vendors.setdefault(oui, m.group("vendor"))
+    strings = bytearray()
+    records = bytearray()
+    for oui in sorted(vendors):
+        records += _OUI_RECORD.pack(oui, len(strings))
+        strings += vendors[oui].encode("utf-8") + b"\x00"
+    _atomic_write(target, _OUI_HEADER.pack(OUI_MAGIC, len(vendors)) + records + strings)
+
+class OuiIndex:
+    """Memory-mapped OUI -> vendor table, built from the text source on first use."""
+
+    def __init__(self, source: Path = OUI_SOURCE_PATH, index: Path = OUI_INDEX_PATH):
+        self.source = source
+        self.index = index
+        self._mm = None
+        self._count = 0
+        self._keys = None
+        self._lock = threading.Lock()
+        self._failed = False
+        self._warming: Optional[threading.Thread] = None
+
+    def warm(self) -> threading.Thread:
+        # Build/map the index off the caller's thread; a full IEEE file takes a while
+        if self._warming is None:
+            self._warming = threading.Thread(target=self._open, daemon=True)
+            self._warming.start()
+        return self._warming
+
+    def _open(self) -> bool:
+        with self._lock:
+            if self._mm is not None or self._failed:
+                return not self._failed
+            try:
+                stale = (not self.index.exists()
+                         or self.index.stat().st_mtime < self.source.stat().st_mtime)
+                if stale:
+                    build_oui_index(self.source, self.index)
+                with open(self.index, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, count = _OUI_HEADER.unpack_from(mm, 0)
+                if magic != OUI_MAGIC:
+                    mm.close()
+                    raise ValueError("bad oui index")
+                self._count = count
+                self._keys = _OuiKeys(mm, count)
+                self._mm = mm  # published last: lookups treat a set _mm as ready
+            except Exception:
+                self._failed = True
+                return False
+            return True
+
+    def lookup(self, mac: str) -> str:
+        digits = re.sub(r"[^0-9a-fA-F]", "", mac or "")
+        if len(digits) < 6:
+            return ""
+        if self._mm is None:
+            # Never block the caller on the index build; vendors fill in on a later pass
+            self.warm()
+            return ""
+        oui = int(digits[:6], 16)
+        pos = bisect.bisect_left(self._keys, oui)
+        if pos >= self._count or self._keys[pos] != oui:
+            return ""
+        _, name_off = _OUI_RECORD.unpack_from(self._mm, _OUI_HEADER.size + pos * _OUI_RECORD.size)
+        start = _OUI_HEADER.size + self._count * _OUI_RECORD.size + name_off
+        end = self._mm.find(b"\x00", start)
+        return self._mm[start:end].decode("utf-8", "replace")
+
+class _OuiKeys:
+    # Sequence view over the mmap so bisect reads records in place
+    def __init__(self, mm, count: int):
+        self._mm = mm
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return _OUI_RECORD.unpack_from(self._mm, _OUI_HEADER.size + i * _OUI_RECORD.size)[0]
+
+# ---------- Enrichment Stage ----------
+class Enricher:
+    """Adds "hostname" and "vendor" to device dicts without blocking the scan."""
+
+    def __init__(self, resolver: Optional[ReverseResolver] = None, oui: Optional[OuiIndex] = None):
+        self.resolver = resolver if resolver is not None else ReverseResolver()
+        self.oui = oui if oui is not None else OuiIndex()
+        self.oui.warm()
+
+    def enrich(self, devices: Dict[str, Dict], callback: Optional[Callable[[str, Dict], None]] = None):
+        for ip, info in devices.items():
+            info["vendor"] = self.oui.lookup(info.get("mac", ""))
+            name = self.resolver.lookup(ip, self._on_resolved(info, callback))
+            info["hostname"] = name or info.get("hostname", "")
+
+    def _on_resolved(self, info: Dict, callback):
+        def done(ip: str, name: str):
+            if name:
+                info["hostname"] = name
+                if callback:
+                    callback(ip, info)
+        return done
+
+    def save(self):
+        self.resolver.cache.save()
@@ -1,10 +1,15 @@
-import json
 import os
-from pathlib import Path
+import threading
+import time
 import customtkinter as ctk
 from tkinter import ttk, filedialog, Menu, simpledialog
 from datetime import datetime
-from scanner import scan_network, threaded_ping
+from scanner import scan_network, threaded_ping, measure_network, traceroute
+from enrich import Enricher
+from settings import Settings, CONFIG_PATH
+from passive import AfPacketSource, PassiveListener
+from device import (Device, Status, make_device, F_MAC, F_HOSTNAME, F_VENDOR, F_STATUS,
+                    F_PROTOCOL, F_PING, F_LOSS, F_JITTER)
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import matplotlib as mpl
@@ -42,14 +47,17 @@ HEADER_BG_LIGHT   = "#e8ecf0"
 GRID_STROKE_LIGHT = "#cfd6dc"
 GRID_ALPHA_LIGHT  = 0.25
 
+# Passively discovered hosts stay listed this long after their last frame
+PASSIVE_KEEP_S = 600
+
+# A filter made only of these could be part of a MAC address
+MAC_FILTER_CHARS = frozenset("0123456789abcdef:")
+
 # Fonts (monospace feel)
 MONO       = ("Cascadia Mono", 11)
 MONO_SMALL = ("Cascadia Mono", 10)
 MONO_BOLD  = ("Cascadia Mono", 11, "bold")
 
-# Persisted settings file
-CONFIG_PATH = Path.home() / ".network-monitor.json"
-
 
 class NetworkMonitorGUI(ctk.CTk):
     def __init__(self, refresh_interval=5000):
@@ -68,22 +76,34 @@ class NetworkMonitorGUI(ctk.CTk):
         self.refresh_interval = refresh_interval
         self.devices = {}
         self.pending = 0
+        self.enricher = Enricher()
+        self.trace_target = None
+        self.trace_hops = []
+        self.passive = None
+        self.seen = {}             # {ip: {"first_seen", "last_seen", "mac", "hostname"}}
+        self.arp_ips = set()       # hosts from the last ARP table read
+        self.last_arp_read = 0.0
 
         # Track row IIDs in each table (so we can reattach after detaching on filter)
         self.main_row_ids = set()
         self.watch_row_ids = set()
 
-        # Persistent UI state
-        self.settings = {
+        # Persistent UI state (loaded from CONFIG_PATH, saved debounced + atomically)
+        self.settings = Settings({
             "theme": "Dark",
             "auto_refresh": True,
             "last_filter": "",
-            "watchlist": [],           # list of IP strings
+            "watchlist": [],           # ordered set of IP strings
             "sort_col": "IP",
             "sort_desc": False,
-            "nicknames": {}            # NEW: {ip: nickname}
-        }
-        self._load_settings()
+            "nicknames": {},           # NEW: {ip: nickname}
+            "measure": False,          # burst mode: loss / jitter per host
+            "ping_count": 5,
+            "ping_interval_ms": 200,
+            "passive": False,          # listen for ARP/DHCP instead of fast polling
+            "passive_iface": "",
+            "passive_poll_ms": 60000,  # fallback poll interval while listening
+        }, CONFIG_PATH)
 
         # Apply theme
         ctk.set_appearance_mode(self.settings.get("theme", "Dark"))
@@ -101,6 +121,14 @@ class NetworkMonitorGUI(ctk.CTk):
                                         width=100, command=self.toggle_auto_refresh, font=MONO_SMALL)
         self.toggle_btn.pack(side="left", padx=6, pady=8)
 
+        self.measure_btn = ctk.CTkButton(self.topbar, text=self._measure_text(),
+                                         width=110, command=self.toggle_measure, font=MONO_SMALL)
+        self.measure_btn.pack(side="left", padx=6, pady=8)
+
+        self.passive_btn = ctk.CTkButton(self.topbar, text=self._passive_text(),
+                                         width=120, command=self.toggle_passive, font=MONO_SMALL)
+        self.passive_btn.pack(side="left", padx=6, pady=8)
+
         self.theme_btn = ctk.CTkButton(self.topbar, text="theme", width=90,
                                        command=self.toggle_mode, font=MONO_SMALL)
         self.theme_btn.pack(side="left", padx=6, pady=8)
@@ -110,6 +138,10 @@ class NetworkMonitorGUI(ctk.CTk):
                                         command=self._open_export_menu, font=MONO_SMALL)
         self.export_btn.pack(side="left", padx=6, pady=8)
 
+        self.import_btn = ctk.CTkButton(self.topbar, text="import", width=90,
+                                        command=self._import_nicknames, font=MONO_SMALL)
+        self.import_btn.pack(side="left", padx=6, pady=8)
+
         self.status_line = ctk.CTkLabel(self.topbar, text="ready", font=MONO_SMALL)
         self.status_line.pack(side="right", padx=10, pady=8)
 
@@ -120,11 +152,15 @@ class NetworkMonitorGUI(ctk.CTk):
         self.kpi_total  = ctk.CTkLabel(self.kpi, text="devices: 0", font=MONO_SMALL)
         self.kpi_online = ctk.CTkLabel(self.kpi, text="online: 0",  font=MONO_SMALL)
         self.kpi_avg    = ctk.CTkLabel(self.kpi, text="avg ping: -", font=MONO_SMALL)
+        self.kpi_loss   = ctk.CTkLabel(self.kpi, text="loss: -",     font=MONO_SMALL)
+        self.kpi_jitter = ctk.CTkLabel(self.kpi, text="jitter: -",   font=MONO_SMALL)
         self.kpi_time   = ctk.CTkLabel(self.kpi, text="last: -",     font=MONO_SMALL)
 
         self.kpi_total.pack(side="left", padx=(10, 12), pady=6)
         self.kpi_online.pack(side="left", padx=12, pady=6)
         self.kpi_avg.pack(side="left", padx=12, pady=6)
+        self.kpi_loss.pack(side="left", padx=12, pady=6)
+        self.kpi_jitter.pack(side="left", padx=12, pady=6)
         self.kpi_time.pack(side="right", padx=10, pady=6)
 
         # ========= Filter Row (with Clear) =========
@@ -137,7 +173,7 @@ class NetworkMonitorGUI(ctk.CTk):
         self.filter_var = ctk.StringVar(value=self.settings.get("last_filter", ""))
         self.filter_entry = ctk.CTkEntry(
             left,
-            placeholder_text="filter ip / mac / nickname / status / protocol / ping (Esc clears)",
+            placeholder_text="filter ip / mac / hostname / vendor / nickname / status / protocol / ping (Esc clears)",
             textvariable=self.filter_var,
             font=MONO_SMALL
         )
@@ -160,7 +196,7 @@ class NetworkMonitorGUI(ctk.CTk):
         main_wrap.pack(expand=True, fill="both", padx=10, pady=(0, 8))
         ctk.CTkLabel(main_wrap, text="All devices", font=MONO_BOLD).pack(anchor="w", padx=8, pady=(6, 0))
 
-        self.columns = ("Nickname", "IP", "MAC", "Status", "Protocol", "Ping (ms)")
+        self.columns = ("Nickname", "IP", "MAC", "Hostname", "Vendor", "Status", "Protocol", "Ping (ms)", "Loss %", "Jitter (ms)")
         self.tree = ttk.Treeview(main_wrap, columns=self.columns, show="headings", selectmode="extended")
         self._style_tree()  # apply theme-aware ttk styles
 
@@ -172,6 +208,9 @@ class NetworkMonitorGUI(ctk.CTk):
             elif col in ("IP", "MAC"):
                 anchor = "w"
                 width = 180 if col == "IP" else 250
+            elif col in ("Hostname", "Vendor"):
+                anchor = "w"
+                width = 200
             else:
                 anchor = "center"
                 width = 110
@@ -198,7 +237,7 @@ class NetworkMonitorGUI(ctk.CTk):
         watch_wrap.pack(fill="both", padx=10, pady=(0, 6))
         ctk.CTkLabel(watch_wrap, text="Watchlist (pinned)", font=MONO_BOLD).pack(anchor="w", padx=8, pady=(6, 0))
 
-        self.watch_columns = ("Nickname", "IP", "MAC", "Status", "Protocol", "Ping (ms)")
+        self.watch_columns = ("Nickname", "IP", "MAC", "Hostname", "Vendor", "Status", "Protocol", "Ping (ms)", "Loss %", "Jitter (ms)")
         self.watch_tree = ttk.Treeview(watch_wrap, columns=self.watch_columns, show="headings", selectmode="extended")
         for col in self.watch_columns:
             self.watch_tree.heading(col, text=col, command=lambda c=col: self._sort_tree(self.watch_tree, c))
@@ -208,6 +247,9 @@ class NetworkMonitorGUI(ctk.CTk):
             elif col in ("IP", "MAC"):
                 anchor = "w"
                 width = 180 if col == "IP" else 250
+            elif col in ("Hostname", "Vendor"):
+                anchor = "w"
+                width = 200
             else:
                 anchor = "center"
                 width = 110
@@ -255,7 +297,10 @@ class NetworkMonitorGUI(ctk.CTk):
         # Handle window close → persist settings
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
-        # Initial scan
+        # Passive listener (if enabled), then initial scan
+        if self.settings.get("passive"):
+            self.settings["passive"] = self._start_passive()
+            self.passive_btn.configure(text=self._passive_text())
         self.refresh()
         # Auto refresh loop
         self.after(self.refresh_interval, self.auto_refresh_loop)
@@ -286,17 +331,22 @@ class NetworkMonitorGUI(ctk.CTk):
         self._style_tree()
         self.watch_tree.tag_configure("Online",  foreground=self.green)
         self.watch_tree.tag_configure("Offline", foreground=self.red)
+        self.watch_tree.tag_configure("Degraded", foreground=self.yellow)
         self.tree.tag_configure("evenrow", background=self.row_even)
         self.tree.tag_configure("oddrow",  background=self.row_odd)
         self.tree.tag_configure("Online",  foreground=self.green)
         self.tree.tag_configure("Offline", foreground=self.red)
+        self.tree.tag_configure("Degraded", foreground=self.yellow)
 
-        for btn in (self.scan_btn, self.toggle_btn, self.theme_btn, self.export_btn, self.clear_btn):
+        for btn in (self.scan_btn, self.toggle_btn, self.measure_btn, self.passive_btn, self.theme_btn, self.export_btn,
+                    self.import_btn, self.clear_btn):
             btn.configure(text_color=self.fg, hover_color=self._hover_color(), fg_color=self._button_color())
-        for lbl in (self.status_line, self.kpi_total, self.kpi_online, self.kpi_avg, self.kpi_time, self.detail_label):
+        for lbl in (self.status_line, self.kpi_total, self.kpi_online, self.kpi_avg, self.kpi_loss,
+                    self.kpi_jitter, self.kpi_time, self.detail_label):
             lbl.configure(text_color=self.fg)
         self.kpi_online.configure(text_color=self.green)
         self.kpi_avg.configure(text_color=self.yellow)
+        self.kpi_loss.configure(text_color=self.red)
         self.status_line.configure(text_color=self.grey)
 
         self.filter_entry.configure(
@@ -372,33 +422,40 @@ class NetworkMonitorGUI(ctk.CTk):
         self._compute_theme_colors()
         self._apply_theme_to_widgets()
         self._reapply_filter_keep_view(scroll_to_top=False)
+        self._save_settings()
 
     # ===================== Persistence =====================
-    def _load_settings(self):
-        try:
-            if CONFIG_PATH.exists():
-                with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.settings.update({k: v for k, v in data.items() if k in self.settings})
-        except Exception:
-            pass  # ignore malformed file
-
     def _save_settings(self):
-        # collect state
-        self.settings["auto_refresh"] = self.settings.get("auto_refresh", True)
+        # collect state; the write itself is coalesced and done off the Tk thread
         self.settings["last_filter"] = self.filter_var.get()
-        # persist watchlist as sorted unique IPs
-        wl = list(dict.fromkeys(self.settings.get("watchlist", [])))
-        self.settings["watchlist"] = wl
-        # write file
+        self.settings.save()
+
+    def _import_nicknames(self):
+        path = filedialog.askopenfilename(
+            title="import nicknames",
+            filetypes=[("Nickname files", "*.json *.csv *.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
         try:
-            with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=2)
-        except Exception:
-            pass
+            count = self.settings.import_nicknames(path)
+        except Exception as e:
+            self.status_line.configure(text=f"import failed: {e}")
+            return
+        # Nicknames live in settings, not on the Device, so redraw just that column
+        nicknames = self.settings["nicknames"]
+        for tree, rows in ((self.tree, self.main_row_ids), (self.watch_tree, self.watch_row_ids)):
+            for ip in rows:
+                try: tree.set(ip, "Nickname", nicknames.get(ip, ""))
+                except Exception: pass
+        self._reapply_filter_keep_view(scroll_to_top=False)
+        self.status_line.configure(text=f"imported {count} nicknames")
 
     def _on_close(self):
-        self._save_settings()
+        self._stop_passive()
+        self.settings["last_filter"] = self.filter_var.get()
+        self.settings.close()
+        self.enricher.save()
         self.destroy()
 
     # ===================== App Logic =====================
@@ -407,6 +464,14 @@ class NetworkMonitorGUI(ctk.CTk):
         self.toggle_btn.configure(text=f"auto: {'ON' if self.settings['auto_refresh'] else 'OFF'}")
         self._save_settings()
 
+    def _measure_text(self):
+        return f"loss: {'ON' if self.settings.get('measure') else 'OFF'}"
+
+    def toggle_measure(self):
+        self.settings["measure"] = not self.settings.get("measure", False)
+        self.measure_btn.configure(text=self._measure_text())
+        self._save_settings()
+
     def auto_refresh_loop(self):
         if self.settings.get("auto_refresh", True):
             self.refresh()
@@ -414,36 +479,76 @@ class NetworkMonitorGUI(ctk.CTk):
 
     def refresh(self):
         self.status_line.configure(text="scanning…")
-        self.devices = scan_network()
+        previous = self.devices
+        devices = {}
+
+        # With the passive listener running the ARP table is only a slow fallback;
+        # pings still go out every refresh
+        poll_s = self.settings.get("passive_poll_ms", 60000) / 1000.0
+        if not self.passive or time.monotonic() - self.last_arp_read >= poll_s:
+            self.last_arp_read = time.monotonic()
+            # Reuse known Device records so history and unchanged cells survive the rescan
+            for ip, dev in scan_network().items():
+                old = previous.get(ip)
+                if old is not None:
+                    if dev.mac_int:
+                        old.mac_int = dev.mac_int
+                    dev = old
+                devices[ip] = dev
+            self.arp_ips = set(devices)
+        else:
+            for ip in self.arp_ips:
+                if ip in previous:
+                    devices[ip] = previous[ip]
+
+        # Forget sightings older than PASSIVE_KEEP_S; keep recent hosts the ARP table lacks
+        now = time.time()
+        for ip in [ip for ip, seen in self.seen.items() if now - seen["last_seen"] >= PASSIVE_KEEP_S]:
+            del self.seen[ip]
+        for ip, seen in self.seen.items():
+            if ip not in devices:
+                devices[ip] = previous.get(ip) or Device(ip, seen["mac"], hostname=seen["hostname"])
 
         # Ensure watchlist IPs are included in the scan set (so they get pinged)
         for ip in self.settings.get("watchlist", []):
-            if ip not in self.devices:
-                self.devices[ip] = {"mac": "", "status": "Offline", "ping": None, "history": [], "protocol": ""}
+            if ip not in devices:
+                dev = previous.get(ip) or make_device(ip)
+                if dev is not None:
+                    devices[ip] = dev
+        self.devices = devices
+        for ip, info in devices.items():
+            self._stamp_seen(ip, info)
+
+        # Vendor + cached hostnames now; uncached PTR lookups stream in later
+        self.enricher.enrich(self.devices, callback=self._on_enriched)
 
         # Save view state
         y_top = self.tree.yview()[0] if self.tree.get_children() else 0.0
         selection = self.tree.selection()
 
-        # Reset tables
-        for iid in list(self.main_row_ids):
+        # Drop rows for hosts that are gone; surviving rows only redraw their dirty cells
+        watchlist = self.settings.get("watchlist", [])
+        for iid in [iid for iid in self.main_row_ids if iid not in devices]:
             try: self.tree.delete(iid)
             except Exception: pass
-        self.main_row_ids.clear()
-
-        for iid in list(self.watch_row_ids):
+            self.main_row_ids.discard(iid)
+        for iid in [iid for iid in self.watch_row_ids if iid not in watchlist]:
             try: self.watch_tree.delete(iid)
             except Exception: pass
-        self.watch_row_ids.clear()
+            self.watch_row_ids.discard(iid)
 
         # Populate WATCHLIST first (always visible, regardless of filter)
-        for ip in self.settings.get("watchlist", []):
-            info = self.devices.get(ip, {"mac":"", "status":"Scanning…", "ping":"", "protocol":""})
-            self._insert_row(self.watch_tree, self.watch_row_ids, ip, info)
+        for ip in watchlist:
+            if ip not in self.watch_row_ids:
+                info = devices.get(ip, {"mac":"", "status":"Scanning…", "ping":"", "protocol":""})
+                self._insert_row(self.watch_tree, self.watch_row_ids, ip, info)
 
         # Populate MAIN table
-        for idx, (ip, info) in enumerate(self.devices.items()):
-            self._insert_row(self.tree, self.main_row_ids, ip, info, idx)
+        for idx, (ip, info) in enumerate(devices.items()):
+            if ip in self.main_row_ids:
+                self._render_row(ip, info)
+            else:
+                self._insert_row(self.tree, self.main_row_ids, ip, info, idx)
 
         # Re-apply filter to MAIN only
         self._reapply_filter_keep_view(scroll_to_top=False)
@@ -457,16 +562,21 @@ class NetworkMonitorGUI(ctk.CTk):
                     self.tree.selection_add(iid)
 
         self.pending = len(self.devices)
-        threaded_ping(self.devices, callback=self._on_ping_result)
+        self._ping_devices(self.devices)
+
+    def _ping_devices(self, devices):
+        if self.settings.get("measure"):
+            measure_network(devices, count=self.settings.get("ping_count", 5),
+                            interval_ms=self.settings.get("ping_interval_ms", 200),
+                            callback=self._on_ping_result)
+        else:
+            threaded_ping(devices, callback=self._on_ping_result)
 
     def _insert_row(self, tree, row_set, ip, info, idx=None):
-        # Get nickname
-        nickname = self.settings.get("nicknames", {}).get(ip, "")
-        
         # Build status badge with icon (if available)
         status_text = info.get("status", "Scanning…")
         icon = self.icon_online if status_text == "Online" else self.icon_offline if status_text == "Offline" else None
-        values = (nickname, ip, info.get("mac", ""), status_text, info.get("protocol", ""), self._ping_text(info.get("ping")))
+        values = self._row_values(ip, info, status_text)
         try:
             tree.insert("", "end", iid=str(ip), values=values)
             row_set.add(str(ip))
@@ -474,14 +584,42 @@ class NetworkMonitorGUI(ctk.CTk):
             if tree is self.tree:
                 if idx is not None:
                     tree.item(str(ip), tags=("evenrow" if idx % 2 == 0 else "oddrow",))
-                if status_text in ("Online", "Offline"):
+                if status_text in ("Online", "Offline", "Degraded"):
                     tree.item(str(ip), tags=(status_text,))
             else:
-                if status_text in ("Online", "Offline"):
+                if status_text in ("Online", "Offline", "Degraded"):
                     tree.item(str(ip), tags=(status_text,))
         except Exception:
             pass
 
+    def _row_values(self, ip, info, status_text=None):
+        nickname = self.settings.get("nicknames", {}).get(ip, "")
+        if status_text is None:
+            status_text = info.get("status", "?")
+        return (nickname, ip, info.get("mac", ""), info.get("hostname", ""), info.get("vendor", ""),
+                status_text, info.get("protocol", ""), self._ping_text(info.get("ping")),
+                self._ping_text(info.get("loss")), self._ping_text(info.get("jitter")))
+
+    def _dirty_cells(self, info, bits):
+        cells = []
+        if bits & F_MAC:
+            cells.append(("MAC", info.mac))
+        if bits & F_HOSTNAME:
+            cells.append(("Hostname", info.hostname))
+        if bits & F_VENDOR:
+            cells.append(("Vendor", info.vendor))
+        if bits & F_STATUS:
+            cells.append(("Status", info.status.label))
+        if bits & F_PROTOCOL:
+            cells.append(("Protocol", info.protocol))
+        if bits & F_PING:
+            cells.append(("Ping (ms)", self._ping_text(info.ping)))
+        if bits & F_LOSS:
+            cells.append(("Loss %", self._ping_text(info.loss)))
+        if bits & F_JITTER:
+            cells.append(("Jitter (ms)", self._ping_text(info.jitter)))
+        return cells
+
     def _ping_text(self, val):
         if val is None or val == "":
             return ""
@@ -493,38 +631,21 @@ class NetworkMonitorGUI(ctk.CTk):
     def _on_ping_result(self, ip, info):
         self.after(0, lambda: self._update_row(ip, info))
 
+    def _on_enriched(self, ip, info):
+        self.after(0, lambda: self._render_row(ip, info) if self.devices.get(ip) is info else None)
+
     def _update_row(self, ip, info):
         ip = str(ip)
-        nickname = self.settings.get("nicknames", {}).get(ip, "")
-        values = (nickname, ip, info.get("mac", ""), info.get("status", "?"),
-                  info.get("protocol",""), self._ping_text(info.get("ping")))
-
-        # Update MAIN
-        if ip in self.main_row_ids:
-            try:
-                self.tree.item(ip, values=values, tags=(info.get("status",""),))
-            except Exception:
-                pass
-            # If filter active, re-evaluate only this row
-            if self.filter_var.get().strip():
-                self._apply_filter_to_iid(ip, self.filter_var.get().lower().strip())
-
-        # Update WATCHLIST (always visible)
-        if ip in self.watch_row_ids:
-            try:
-                self.watch_tree.item(ip, values=values, tags=(info.get("status",""),))
-            except Exception:
-                pass
-
-        # Update details if selected
-        sel = self.tree.selection()
-        if sel and sel[0] == ip:
-            self.show_details(None)
+        # A ping reply is a real sighting
+        if info.status in (Status.ONLINE, Status.DEGRADED):
+            self._mark_seen(ip, time.time(), info.mac)
+            self._stamp_seen(ip, info)
+        self._render_row(ip, info)
 
         # Live KPI & chart
         self._update_kpis_live()
-        online_count = sum(1 for d in self.devices.values() if d.get("status") == "Online")
-        pings = [d["ping"] for d in self.devices.values() if d.get("ping") is not None]
+        online_count = sum(1 for d in self.devices.values() if d.status in (Status.ONLINE, Status.DEGRADED))
+        pings = [d.ping for d in self.devices.values() if d.ping is not None]
         avg_ping = (sum(pings) / len(pings)) if pings else 0.0
         self._update_chart_curves(live=(online_count, avg_ping))
         self._chart_needs_draw = True
@@ -535,6 +656,31 @@ class NetworkMonitorGUI(ctk.CTk):
             self._commit_chart_point()
             self.status_line.configure(text="ready")
 
+    def _render_row(self, ip, info):
+        ip = str(ip)
+        bits = info.take_dirty()
+        cells = self._dirty_cells(info, bits)
+        if cells or bits & F_STATUS:
+            # Update MAIN, then WATCHLIST (always visible): only the cells that changed
+            for tree, rows in ((self.tree, self.main_row_ids), (self.watch_tree, self.watch_row_ids)):
+                if ip not in rows:
+                    continue
+                try:
+                    for col, text in cells:
+                        tree.set(ip, col, text)
+                    if bits & F_STATUS:
+                        tree.item(ip, tags=(info.status.label,))
+                except Exception:
+                    pass
+            # If filter active, re-evaluate only this row
+            if ip in self.main_row_ids and self.filter_var.get().strip():
+                self._apply_filter_to_iid(ip, self.filter_var.get().lower().strip())
+
+        # Update details if selected
+        sel = self.tree.selection()
+        if sel and sel[0] == ip:
+            self.show_details(None)
+
     # ===================== Filter (persistent, stable) =====================
     def _on_filter_changed(self, *args):
         # Remember in settings and reapply
@@ -566,20 +712,20 @@ class NetworkMonitorGUI(ctk.CTk):
             self.tree.yview_moveto(0.0)
 
     def _matches_filter(self, iid, txt_lower):
-        info = self.devices.get(iid, {})
-        nickname = self.settings.get("nicknames", {}).get(iid, "")
-        values = (
-            nickname,
-            iid,
-            info.get("mac", ""),
-            info.get("status", ""),
-            info.get("protocol", ""),
-            info.get("ping", ""),
-        )
-        try:
-            return any(txt_lower in str(v).lower() for v in values)
-        except Exception:
+        # Runs per row on every keystroke: read attributes directly, cheapest first,
+        # and only format the MAC when the filter could be part of one
+        if txt_lower in iid.lower() or txt_lower in self.settings.get("nicknames", {}).get(iid, "").lower():
+            return True
+        info = self.devices.get(iid)
+        if info is None:
             return False
+        for text in (info.hostname, info.vendor, info.status.label, info.protocol):
+            if text and txt_lower in text.lower():
+                return True
+        for num in (info.ping, info.loss, info.jitter):
+            if num is not None and txt_lower in str(num):
+                return True
+        return bool(info.mac_int) and MAC_FILTER_CHARS.issuperset(txt_lower) and txt_lower in info.mac
 
     def _apply_filter_to_iid(self, iid, txt_lower):
         try:
@@ -592,6 +738,11 @@ class NetworkMonitorGUI(ctk.CTk):
 
     # ---------------- Details & KPIs --------------
     def show_details(self, event):
+        # A live traceroute owns the panel until the user picks a row again
+        if self.trace_target is not None:
+            if event is None:
+                return
+            self.trace_target = None
         selected = self.tree.selection()
         if not selected:
             return
@@ -612,17 +763,207 @@ class NetworkMonitorGUI(ctk.CTk):
             "nickname: {nick}\n"
             "ip: {ip}\n"
             "mac: {mac}\n"
+            "hostname: {host}\n"
+            "vendor: {vendor}\n"
             "status: {status}\n"
             "protocol: {proto}\n"
             "ping: {ping}\n"
+            "loss: {loss}\n"
+            "rtt min/avg/max/mdev: {rtt}\n"
+            "jitter: {jitter}\n"
+            "first seen: {first}\n"
+            "last seen: {last}\n"
             "history (last 10): {hist}"
         ).format(
             nick=nickname,
             ip=ip,
             mac=info.get("mac", "N/A"),
+            host=info.get("hostname", "") or "-",
+            vendor=info.get("vendor", "") or "-",
             status=info.get("status", "N/A"),
             proto=info.get("protocol", ""),
             ping=ping_text,
+            loss="-" if info.get("loss") is None else f"{info['loss']:.1f}%",
+            rtt="-" if info.get("rtt_min") is None else "{:.1f}/{:.1f}/{:.1f}/{:.1f} ms".format(
+                info["rtt_min"], info["ping"], info["rtt_max"], info["rtt_mdev"]),
+            jitter="-" if info.get("jitter") is None else f"{info['jitter']:.1f} ms",
+            first=self._time_text(info.get("first_seen")),
+            last=self._time_text(info.get("last_seen")),
             hist=history_text,
         )
-        self.detail_label.configure(text=text)
\ No newline at end of file
+        self.detail_label.configure(text=text)
+
+    def _update_kpis_live(self):
+        devices = list(self.devices.values())
+        online = [d for d in devices if d.status in (Status.ONLINE, Status.DEGRADED)]
+        pings = [d.ping for d in devices if d.ping is not None]
+        losses = [d.loss for d in devices if d.loss is not None]
+        jitters = [d.jitter for d in devices if d.jitter is not None]
+        self.kpi_total.configure(text=f"devices: {len(devices)}")
+        self.kpi_online.configure(text=f"online: {len(online)}")
+        self.kpi_avg.configure(text=f"avg ping: {sum(pings) / len(pings):.1f} ms" if pings else "avg ping: -")
+        self.kpi_loss.configure(text=f"loss: {sum(losses) / len(losses):.1f}%" if losses else "loss: -")
+        self.kpi_jitter.configure(text=f"jitter: {sum(jitters) / len(jitters):.1f} ms" if jitters else "jitter: -")
+        self.kpi_time.configure(text=f"last: {datetime.now():%H:%M:%S}")
+
+    # ---------------- Watchlist context menu & traceroute --------------
+    def _open_context_menu_watch(self, event):
+        iid = self.watch_tree.identify_row(event.y)
+        if not iid:
+            return
+        self.watch_tree.selection_set(iid)
+        info = self.devices.get(iid, {})
+        menu = Menu(self, tearoff=0)
+        menu.add_command(
+            label="traceroute" if info.get("status") != "Online" else "traceroute (host is online)",
+            command=lambda: self._start_traceroute(iid),
+        )
+        menu.add_command(label="remove from watchlist", command=lambda: self._remove_from_watchlist(iid))
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
+
+    def _remove_from_watchlist(self, ip):
+        self.settings["watchlist"].discard(ip)
+        if ip in self.watch_row_ids:
+            try: self.watch_tree.delete(ip)
+            except Exception: pass
+            self.watch_row_ids.discard(ip)
+        self._save_settings()
+
+    def _start_traceroute(self, ip):
+        self.trace_target = ip
+        self.trace_hops = []
+        self.status_line.configure(text=f"tracing {ip}…")
+        self._show_trace(ip)
+
+        def on_hop(host, hop):
+            self.after(0, lambda: self._on_trace_hop(host, hop))
+
+        def run():
+            path = traceroute(ip, callback=on_hop)
+            self.after(0, lambda: self._on_trace_done(ip, path))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _on_trace_hop(self, ip, hop):
+        if ip != self.trace_target:
+            return
+        self.trace_hops = sorted(
+            [h for h in self.trace_hops if h["ttl"] != hop["ttl"]] + [hop], key=lambda h: h["ttl"]
+        )
+        self._show_trace(ip)
+
+    def _on_trace_done(self, ip, path):
+        if ip == self.trace_target:
+            # Streamed hops are provisional; the returned path is cut at the destination
+            self.trace_hops = list(path)
+            self.status_line.configure(text="ready")
+            self._show_trace(ip, done=True)
+
+    def _show_trace(self, ip, done=False):
+        lines = [f"traceroute {ip}" + ("" if done else " …")]
+        for hop in self.trace_hops:
+            rtt = "*" if hop["rtt"] is None else f"{hop['rtt']:.1f} ms"
+            lines.append(f"{hop['ttl']:>2}  {hop['ip']:<15} {rtt}")
+        if done and not self.trace_hops:
+            lines.append("no route information")
+        self.detail_label.configure(text="\n".join(lines))
+
+    # ---------------- Passive discovery --------------
+    def _passive_text(self):
+        return f"passive: {'ON' if self.settings.get('passive') else 'OFF'}"
+
+    def toggle_passive(self):
+        if self.passive:
+            self._stop_passive()
+            self.settings["passive"] = False
+        else:
+            self.settings["passive"] = self._start_passive()
+        self.passive_btn.configure(text=self._passive_text())
+        self._save_settings()
+
+    def _start_passive(self):
+        try:
+            source = AfPacketSource(self.settings.get("passive_iface", ""))
+        except Exception as e:
+            self.status_line.configure(text=f"passive unavailable: {e}")
+            return False
+        listener = PassiveListener(source, self._on_passive_sighting,
+                                   on_error=lambda e: self.after(0, lambda: self._on_passive_error(listener, e)))
+        self.passive = listener.start()
+        return True
+
+    def _stop_passive(self):
+        if self.passive:
+            self.passive.stop()
+            self.passive = None
+
+    def _on_passive_error(self, listener, error):
+        # Capture died (interface gone, permissions dropped): back to normal polling
+        if self.passive is not listener:
+            return
+        self._stop_passive()
+        self.settings["passive"] = False
+        self.passive_btn.configure(text=self._passive_text())
+        self._save_settings()
+        self.status_line.configure(text=f"passive stopped: {error}")
+
+    def _on_passive_sighting(self, ip, mac, hostname, source, ts):
+        self.after(0, lambda: self._apply_sighting(ip, mac, hostname, ts))
+
+    def _apply_sighting(self, ip, mac, hostname, ts):
+        self._mark_seen(ip, ts, mac, hostname)
+        info = self.devices.get(ip)
+        if info is None:
+            # New host: show it immediately and ping just this one
+            info = Device(ip, mac, Status.SCANNING, hostname)
+            self.devices[ip] = info
+            self._stamp_seen(ip, info)
+            self.enricher.enrich({ip: info}, callback=self._on_enriched)
+            self._insert_row(self.tree, self.main_row_ids, ip, info, len(self.main_row_ids))
+            txt = self.filter_var.get().lower().strip()
+            if txt:
+                self._apply_filter_to_iid(ip, txt)
+            self.pending += 1
+            self._ping_devices({ip: info})
+            return
+        self._stamp_seen(ip, info)
+        changed = False
+        if mac and info.mac != mac:
+            info.mac = mac
+            info.vendor = self.enricher.oui.lookup(mac)
+            changed = True
+        if hostname and not info.hostname:
+            info.hostname = hostname
+            changed = True
+        if changed:
+            self._render_row(ip, info)
+        else:
+            sel = self.tree.selection()
+            if sel and sel[0] == ip:
+                self.show_details(None)
+
+    def _mark_seen(self, ip, ts, mac="", hostname=""):
+        seen = self.seen.get(ip)
+        if seen is None:
+            self.seen[ip] = {"first_seen": ts, "last_seen": ts, "mac": mac, "hostname": hostname}
+            return
+        seen["first_seen"] = min(seen["first_seen"], ts)
+        seen["last_seen"] = max(seen["last_seen"], ts)
+        if mac:
+            seen["mac"] = mac
+        if hostname:
+            seen["hostname"] = hostname
+
+    def _stamp_seen(self, ip, info):
+        seen = self.seen.get(ip)
+        if seen:
+            info.first_seen = seen["first_seen"]
+            info.last_seen = seen["last_seen"]
+
+    def _time_text(self, ts):
+        if not ts:
+            return "-"
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
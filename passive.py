@@ -0,0 +1,247 @@
+# ---------- Imports ----------
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+# ---------- Frame Layout ----------
+ETH_P_ALL = 0x0003
+ETH_P_ARP = 0x0806
+ETH_P_IP = 0x0800
+ETH_P_8021Q = 0x8100
+DHCP_MAGIC = b"\x63\x82\x53\x63"
+DHCP_PORTS = (67, 68)
+
+_U16 = struct.Struct("!H")
+_ARP_ETH_IPV4 = b"\x00\x01\x08\x00\x06\x04"  # htype, ptype, hlen, plen
+_PCAP_HDR = struct.Struct("IHHiIII")
+_PCAP_REC = struct.Struct("IIII")
+
+# (ip, mac, hostname, source, timestamp)
+Sighting = Tuple[str, str, str, str, float]
+
+def _mac(buf, off: int) -> str:
+    return "%02x:%02x:%02x:%02x:%02x:%02x" % tuple(buf[off:off + 6])
+
+def _ip(buf, off: int) -> str:
+    return "%d.%d.%d.%d" % tuple(buf[off:off + 4])
+
+# ---------- Parsers ----------
+def parse_frame(buf, length: int, ts: float) -> Optional[Sighting]:
+    # Fixed-offset reads straight off the receive buffer; nothing is sliced
+    # or decoded unless the frame turns out to be ARP or DHCP.
+    if length < 14:
+        return None
+    off = 12
+    ethertype = _U16.unpack_from(buf, off)[0]
+    if ethertype == ETH_P_8021Q and length >= 18:
+        off += 4
+        ethertype = _U16.unpack_from(buf, off)[0]
+    off += 2
+    if ethertype == ETH_P_ARP:
+        return _parse_arp(buf, off, length, ts)
+    if ethertype == ETH_P_IP:
+        return _parse_dhcp(buf, off, length, ts)
+    return None
+
+def _parse_arp(buf, off: int, length: int, ts: float) -> Optional[Sighting]:
+    # htype=1 (Ethernet), ptype=IPv4, hlen=6, plen=4
+    if length < off + 28 or buf[off:off + 6] != _ARP_ETH_IPV4:
+        return None
+    if buf[off + 14:off + 18] == b"\x00\x00\x00\x00":
+        return None  # ARP probe, sender has no address yet
+    return (_ip(buf, off + 14), _mac(buf, off + 8), "", "arp", ts)
+
+def _parse_dhcp(buf, off: int, length: int, ts: float) -> Optional[Sighting]:
+    if length < off + 20 or buf[off + 9] != 17:  # UDP only
+        return None
+    ihl = (buf[off] & 0x0F) * 4
+    udp = off + ihl
+    if length < udp + 8 + 240:
+        return None
+    sport, dport = _U16.unpack_from(buf, udp)[0], _U16.unpack_from(buf, udp + 2)[0]
+    if sport not in DHCP_PORTS or dport not in DHCP_PORTS:
+        return None
+    bootp = udp + 8
+    if buf[bootp + 236:bootp + 240] != DHCP_MAGIC or buf[bootp + 1] != 1:
+        return None
+    ciaddr, yiaddr = bootp + 12, bootp + 16
+    mac = _mac(buf, bootp + 28)
+    msg_type, requested, hostname = 0, None, ""
+    opt = bootp + 240
+    while opt < length:
+        code = buf[opt]
+        if code == 255:
+            break
+        if code == 0:
+            opt += 1
+            continue
+        if opt + 1 >= length:
+            break
+        size = buf[opt + 1]
+        val = opt + 2
+        if val + size > length:
+            break
+        if code == 53 and size >= 1:
+            msg_type = buf[val]
+        elif code == 50 and size == 4:
+            requested = val
+        elif code == 12 and size:
+            hostname = bytes(buf[val:val + size]).decode("ascii", "replace").strip("\x00")
+        opt = val + size
+    if msg_type == 5:  # ACK: server confirms yiaddr for chaddr
+        ip_off = yiaddr
+    elif msg_type in (3, 8):  # REQUEST / INFORM from the client
+        ip_off = requested if requested is not None else ciaddr
+    else:
+        return None
+    if buf[ip_off:ip_off + 4] == b"\x00\x00\x00\x00":
+        return None
+    return (_ip(buf, ip_off), mac, hostname, "dhcp", ts)
+
+# ---------- Sources ----------
+class AfPacketSource:
+    """Live frames from a Linux AF_PACKET socket (needs CAP_NET_RAW)."""
+
+    def __init__(self, iface: str = "", bufsize: int = 65535):
+        if not hasattr(socket, "AF_PACKET"):
+            raise OSError("AF_PACKET capture is only available on Linux")
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        if iface:
+            self.sock.bind((iface, 0))
+        self.sock.settimeout(1.0)
+        self.buf = bytearray(bufsize)
+        self.view = memoryview(self.buf)
+        self.closed = False
+
+    def frames(self) -> Iterator[Tuple[memoryview, int, float]]:
+        # One buffer reused for every frame
+        while not self.closed:
+            try:
+                n = self.sock.recv_into(self.buf)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self.closed:
+                    return
+                raise
+            yield self.view, n, time.time()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+
+class PcapSource:
+    """Replays an Ethernet pcap file; realtime=True keeps the original pacing."""
+
+    def __init__(self, path: str, realtime: bool = False):
+        self.path = path
+        self.realtime = realtime
+        self.closed = False
+
+    def frames(self) -> Iterator[Tuple[memoryview, int, float]]:
+        with open(self.path, "rb") as f:
+            header = f.read(_PCAP_HDR.size)
+            magic = header[:4]
+            if magic in (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1"):
+                order = "<"
+            elif magic in (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
+                order = ">"
+            else:
+                raise ValueError("not a pcap file")
+            nano = magic in (b"\x4d\x3c\xb2\xa1", b"\xa1\xb2\x3c\x4d")
+            hdr = struct.Struct(order + _PCAP_HDR.format)
+            rec = struct.Struct(order + _PCAP_REC.format)
+            if hdr.unpack(header)[6] != 1:
+                raise ValueError("only Ethernet (linktype 1) captures are supported")
+            buf = bytearray(65535)
+            view = memoryview(buf)
+            first_ts, started = None, time.monotonic()
+            while not self.closed:
+                raw = f.read(rec.size)
+                if len(raw) < rec.size:
+                    return
+                sec, frac, incl, _orig = rec.unpack(raw)
+                if incl > len(buf):
+                    buf = bytearray(incl)
+                    view = memoryview(buf)
+                n = f.readinto(view[:incl])
+                if n < incl:
+                    return
+                ts = sec + frac / (1e9 if nano else 1e6)
+                if self.realtime:
+                    if first_ts is None:
+                        first_ts = ts
+                    delay = (ts - first_ts) - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                yield view, n, ts
+
+    def close(self):
+        self.closed = True
+
+# ---------- Listener ----------
+class PassiveListener:
+    """Feeds ARP/DHCP sightings from a frame source to a callback on a daemon thread.
+
+    If the source fails, on_error receives the exception and the listener stops.
+    """
+
+    def __init__(self, source, callback: Callable[[str, str, str, str, float], None],
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.source = source
+        self.callback = callback
+        self.on_error = on_error
+        self.frames = 0
+        self.sightings = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        try:
+            for buf, n, ts in self.source.frames():
+                self.frames += 1
+                seen = parse_frame(buf, n, ts)
+                if seen is None:
+                    continue
+                self.sightings += 1
+                try:
+                    self.callback(*seen)
+                except Exception:
+                    pass  # a bad consumer must not stop the capture
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(e)
+
+    def stop(self):
+        self.source.close()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread:
+            self._thread.join(timeout)
+
+# ---------- Replay / Benchmark ----------
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python passive.py capture.pcap")
+        sys.exit(2)
+    hosts = {}
+    listener = PassiveListener(PcapSource(sys.argv[1]),
+                               lambda ip, mac, name, src, ts: hosts.__setitem__(ip, (mac, name, src)))
+    t0 = time.perf_counter()
+    listener.run()
+    elapsed = time.perf_counter() - t0
+    for ip, (mac, name, src) in sorted(hosts.items()):
+        print(f"{ip:<15} {mac}  {src:<4} {name}")
+    rate = listener.frames / elapsed if elapsed else 0.0
+    print(f"{listener.frames} frames, {listener.sightings} sightings, "
+          f"{len(hosts)} hosts in {elapsed:.3f}s ({rate:,.0f} frames/s)")
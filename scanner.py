@@ -1,10 +1,16 @@
 # ---------- Imports ----------
 import subprocess
 import platform
+import itertools
 import re
 import threading
 import socket
-from typing import Dict, Any
+import os
+import select
+import struct
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from device import Device, Status
 
 # ---------- Regex Patterns ----------
 MAC_WIN = re.compile(
@@ -33,26 +39,20 @@ def _parse_arp(system: str, text: str):
         for m in MAC_WIN.finditer(text):
             ip = m.group("ip")
             mac = m.group("mac").lower().replace("-", ":")
-            devices[ip] = {
-                "mac": mac, "status": "Offline", "ping": None,
-                "history": [], "protocol": ""
-            }
+            devices[ip] = Device(ip, mac)
     else:
         for m in MAC_UNIX.finditer(text):
             ip = m.group("ip")
             mac = m.group("mac").lower()
             if mac == "<incomplete>":
                 mac = ""
-            devices[ip] = {
-                "mac": mac, "status": "Offline", "ping": None,
-                "history": [], "protocol": ""
-            }
+            devices[ip] = Device(ip, mac)
     return devices
 
 # ---------- Network Scanning ----------
-def scan_network() -> Dict[str, Dict[str, Any]]:
+def scan_network() -> Dict[str, Device]:
     system = platform.system()
-    devices: Dict[str, Dict[str, Any]] = {}
+    devices: Dict[str, Device] = {}
     try:
         result = subprocess.run(["arp", "-a"], capture_output=True, text=True)
         if result.returncode == 0 and result.stdout:
@@ -72,10 +72,7 @@ def scan_network() -> Dict[str, Dict[str, Any]]:
                     if m:
                         ip = m.group("ip")
                         mac = m.group("mac").lower()
-                        devices[ip] = {
-                            "mac": mac, "status": "Offline", "ping": None,
-                            "history": [], "protocol": ""
-                        }
+                        devices[ip] = Device(ip, mac)
         except Exception:
             pass
     return devices
@@ -115,18 +112,21 @@ def detect_protocol(host: str, timeout_ms: int = 200) -> str:
     return "TCP"
 
 # ---------- Concurrent Ping ----------
-def threaded_ping(devices: Dict[str, Dict[str, Any]], callback=None):
+def threaded_ping(devices: Dict[str, Device], callback=None):
     threads = []
-    def worker(ip: str, info: Dict[str, Any]):
+    def worker(ip: str, info: Device):
         latency = ping(ip)
-        info["ping"] = latency
-        info["status"] = "Online" if latency is not None else "Offline"
-        info["history"].append(info["status"])
-        if info["status"] == "Online":
+        info.ping = latency
+        # Records outlive a scan: drop burst-only figures a single probe cannot refresh
+        info.loss = info.jitter = info.rtt_min = info.rtt_max = info.rtt_mdev = None
+        info.record(Status.ONLINE if latency is not None else Status.OFFLINE)
+        if info.status == Status.ONLINE:
             try:
-                info["protocol"] = detect_protocol(ip)
+                info.protocol = detect_protocol(ip)
             except Exception:
-                info["protocol"] = "TCP"
+                info.protocol = "TCP"
+        else:
+            info.protocol = ""
         if callback:
             try:
                 callback(ip, info)
@@ -136,4 +136,411 @@ def threaded_ping(devices: Dict[str, Dict[str, Any]], callback=None):
         t = threading.Thread(target=worker, args=(ip, info), daemon=True)
         t.start()
         threads.append(t)
-    return threads
\ No newline at end of file
+    return threads
+
+# ---------- Loss / Jitter Measurement ----------
+DEGRADED_LOSS = 20.0  # % loss at which a reachable host is flagged Degraded
+
+# Raw ICMP sockets see every echo reply on the host, so bursts running at the
+# same time (a refresh plus a passive sighting) each need their own ident
+_echo_idents = itertools.count(os.getpid() & 0xFFFF)
+
+def _next_echo_ident() -> int:
+    return next(_echo_idents) & 0xFFFF
+
+class PingStats:
+    # Streaming min/avg/max/mdev (Welford) and jitter (mean |delta| of consecutive RTTs)
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.min = None
+        self.max = None
+        self.avg = 0.0
+        self._m2 = 0.0
+        self._last = None
+        self._jitter_sum = 0.0
+        self._jitter_n = 0
+
+    def add(self, rtt: Optional[float]):
+        self.sent += 1
+        if rtt is None:
+            return
+        self.received += 1
+        self.min = rtt if self.min is None else min(self.min, rtt)
+        self.max = rtt if self.max is None else max(self.max, rtt)
+        delta = rtt - self.avg
+        self.avg += delta / self.received
+        self._m2 += delta * (rtt - self.avg)
+        if self._last is not None:
+            self._jitter_sum += abs(rtt - self._last)
+            self._jitter_n += 1
+        self._last = rtt
+
+    @property
+    def loss(self) -> float:
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 100.0
+
+    @property
+    def mdev(self) -> float:
+        return (self._m2 / self.received) ** 0.5 if self.received else 0.0
+
+    @property
+    def jitter(self) -> float:
+        return self._jitter_sum / self._jitter_n if self._jitter_n else 0.0
+
+def status_from_loss(loss: float) -> Status:
+    if loss >= 100.0:
+        return Status.OFFLINE
+    return Status.DEGRADED if loss >= DEGRADED_LOSS else Status.ONLINE
+
+def _apply_stats(info: Device, stats: PingStats):
+    info.loss = round(stats.loss, 1)
+    info.ping = round(stats.avg, 2) if stats.received else None
+    info.rtt_min = round(stats.min, 2) if stats.received else None
+    info.rtt_max = round(stats.max, 2) if stats.received else None
+    info.rtt_mdev = round(stats.mdev, 2) if stats.received else None
+    info.jitter = round(stats.jitter, 2) if stats.received else None
+    info.record(status_from_loss(stats.loss))
+
+def _finish_host(ip: str, info: Device, callback=None):
+    if info.status != Status.OFFLINE:
+        try:
+            info.protocol = detect_protocol(ip)
+        except Exception:
+            info.protocol = "TCP"
+    else:
+        info.protocol = ""
+    if callback:
+        try:
+            callback(ip, info)
+        except Exception:
+            pass
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def _echo_request(ident: int, seq: int) -> bytes:
+    payload = b"network-monitor"
+    header = struct.pack("!BBHHH", 8, 0, 0, ident, seq)
+    return struct.pack("!BBHHH", 8, 0, _icmp_checksum(header + payload), ident, seq) + payload
+
+def _measure_raw(hosts: List[str], count: int, interval: float, timeout: float, on_done):
+    # Round k sends echo seq=k to every host back to back, so a burst costs
+    # roughly count * interval + timeout regardless of how many hosts there are.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    try:
+        ident = _next_echo_ident()
+        stats = {ip: PingStats() for ip in hosts}
+        pending: Dict[Any, float] = {}
+        outstanding = {ip: count for ip in hosts}
+        next_send = time.monotonic()
+        last_send = next_send + (count - 1) * interval
+        round_no = 0
+        while True:
+            now = time.monotonic()
+            if round_no < count and now >= next_send:
+                for ip in hosts:
+                    try:
+                        sock.sendto(_echo_request(ident, round_no), (ip, 0))
+                        pending[(ip, round_no)] = time.monotonic()
+                    except OSError:
+                        stats[ip].add(None)
+                        outstanding[ip] -= 1
+                round_no += 1
+                next_send += interval
+            # Expire probes that have been outstanding longer than timeout
+            for key, sent_at in list(pending.items()):
+                if now - sent_at > timeout:
+                    del pending[key]
+                    stats[key[0]].add(None)
+                    outstanding[key[0]] -= 1
+            for ip in [ip for ip, left in outstanding.items() if left == 0]:
+                del outstanding[ip]
+                on_done(ip, stats[ip])
+            if not outstanding or (round_no >= count and not pending):
+                break
+            wake = next_send if round_no < count else last_send + timeout
+            if pending:
+                wake = min(wake, min(pending.values()) + timeout)
+            ready, _, _ = select.select([sock], [], [], max(0.0, wake - time.monotonic()))
+            if not ready:
+                continue
+            packet, addr = sock.recvfrom(1024)
+            received_at = time.monotonic()
+            try:
+                ihl = (packet[0] & 0x0F) * 4
+                icmp_type, _code, _sum, r_ident, r_seq = struct.unpack_from("!BBHHH", packet, ihl)
+            except (IndexError, struct.error):
+                continue
+            if icmp_type != 0 or r_ident != ident:
+                continue
+            sent_at = pending.pop((addr[0], r_seq), None)
+            if sent_at is None:
+                continue
+            stats[addr[0]].add((received_at - sent_at) * 1000.0)
+            outstanding[addr[0]] -= 1
+        for ip in list(outstanding):
+            on_done(ip, stats[ip])
+    finally:
+        sock.close()
+
+def _measure_cmd(ip: str, count: int, interval: float, timeout: float) -> PingStats:
+    # Unprivileged fallback: let the system ping pace the burst and parse each reply
+    stats = PingStats()
+    if platform.system() == "Windows":
+        cmd = ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), ip]
+    else:
+        cmd = ["ping", "-n", "-c", str(count), "-i", str(max(0.2, interval)),
+               "-W", str(max(1, int(timeout))), ip]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except Exception:
+        for _ in range(count):
+            stats.add(None)
+        return stats
+    for line in proc.stdout:
+        m = re.search(r"time[=<]\s*(?P<val>\d+\.?\d*)\s*ms", line, re.IGNORECASE)
+        if m:
+            stats.add(float(m.group("val")))
+    proc.wait()
+    while stats.sent < count:
+        stats.add(None)
+    return stats
+
+def measure_network(devices: Dict[str, Device], count: int = 5, interval_ms: int = 200,
+                    timeout_ms: int = 1000, callback=None):
+    count = max(1, int(count))
+    interval, timeout = interval_ms / 1000.0, timeout_ms / 1000.0
+
+    def done(ip: str, stats: PingStats):
+        info = devices[ip]
+        _apply_stats(info, stats)
+        threading.Thread(target=_finish_host, args=(ip, info, callback), daemon=True).start()
+
+    def fallback(hosts: List[str]):
+        for ip in hosts:
+            threading.Thread(
+                target=lambda ip=ip: done(ip, _measure_cmd(ip, count, interval, timeout)),
+                daemon=True,
+            ).start()
+
+    def run():
+        # Replies come back from addresses, so only packed IPv4 hosts use the raw
+        # socket; names (watchlist entries) go straight to the system ping
+        raw = [ip for ip, info in devices.items() if not info.host]
+        fallback([ip for ip, info in devices.items() if info.host])
+        finished = set()
+
+        def raw_done(ip: str, stats: PingStats):
+            finished.add(ip)
+            done(ip, stats)
+
+        try:
+            if raw:
+                _measure_raw(raw, count, interval, timeout, raw_done)
+        except OSError:
+            # Raw sockets unavailable or failed mid-burst: hosts already
+            # reported keep their numbers, only the rest are re-measured
+            fallback([ip for ip in raw if ip not in finished])
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+# ---------- Traceroute ----------
+TRACE_BASE_PORT = 33434
+TRACE_CACHE_TTL = 300.0
+_trace_cache: Dict[str, Any] = {}
+_trace_lock = threading.Lock()
+
+TRACE_UNIX = re.compile(r"^\s*(?P<ttl>\d+)\s+(?P<ip>\d+\.\d+\.\d+\.\d+|\*)(?:\s+(?P<rtt>\d+\.?\d*)\s*ms)?")
+TRACE_WIN = re.compile(r"^\s*(?P<ttl>\d+)\s+(?:(?:<?(?P<rtt>\d+)\s*ms|\*)\s+){3}(?P<ip>\d+\.\d+\.\d+\.\d+)?")
+
+def _hop(ttl: int, ip: str = "*", rtt: Optional[float] = None) -> Dict[str, Any]:
+    return {"ttl": ttl, "ip": ip, "rtt": rtt}
+
+def _parse_trace_reply(packet: bytes) -> Optional[Tuple[int, str, int, int]]:
+    # ICMP time-exceeded / unreachable quoting one of our UDP probes:
+    # (icmp type, quoted destination, quoted source port, quoted destination port)
+    try:
+        ihl = (packet[0] & 0x0F) * 4
+        icmp_type = packet[ihl]
+        if icmp_type not in (3, 11):
+            return None
+        inner = ihl + 8
+        inner_ihl = (packet[inner] & 0x0F) * 4
+        if packet[inner + 9] != socket.IPPROTO_UDP:
+            return None
+        dst = socket.inet_ntoa(packet[inner + 16:inner + 20])
+        udp_sport, udp_dport = struct.unpack_from("!HH", packet, inner + inner_ihl)
+    except (IndexError, struct.error, OSError):
+        return None
+    return icmp_type, dst, udp_sport, udp_dport
+
+def _trace_raw(targets: Dict[str, str], max_hops: int, timeout: float, callback=None) -> Dict[str, List[Dict[str, Any]]]:
+    # One UDP probe per (target, ttl) fired up front; ICMP replies quote our UDP
+    # header, so the destination port recovers the ttl and the quoted dst the target.
+    recv = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    send = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        send.bind(("", 0))
+        sport = send.getsockname()[1]
+        sent: Dict[Any, float] = {}
+        hops: Dict[str, Dict[int, Dict[str, Any]]] = {ip: {} for ip in targets.values()}
+        reached: Dict[str, int] = {}
+        for ttl in range(1, max_hops + 1):
+            send.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+            for ip in hops:
+                try:
+                    send.sendto(b"", (ip, TRACE_BASE_PORT + ttl))
+                    sent[(ip, TRACE_BASE_PORT + ttl)] = time.monotonic()
+                except OSError:
+                    pass
+
+        def done(ip: str) -> bool:
+            last = reached.get(ip)
+            return last is not None and all(t in hops[ip] for t in range(1, last + 1))
+
+        deadline = time.monotonic() + timeout
+        while not all(done(ip) for ip in hops):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([recv], [], [], remaining)
+            if not ready:
+                break
+            packet, addr = recv.recvfrom(1024)
+            now = time.monotonic()
+            reply = _parse_trace_reply(packet)
+            if reply is None:
+                continue
+            icmp_type, dst, udp_sport, udp_dport = reply
+            if udp_sport != sport or (dst, udp_dport) not in sent or dst not in hops:
+                continue
+            ttl = udp_dport - TRACE_BASE_PORT
+            if ttl in hops[dst]:
+                continue
+            hop = _hop(ttl, addr[0], round((now - sent[(dst, udp_dport)]) * 1000.0, 1))
+            hops[dst][ttl] = hop
+            if icmp_type == 3:
+                # Port/host unreachable ends the path; keep the lowest such ttl
+                reached[dst] = min(ttl, reached.get(dst, ttl))
+            if callback and ttl <= reached.get(dst, max_hops):
+                try:
+                    callback(dst, hop)
+                except Exception:
+                    pass
+    finally:
+        recv.close()
+        send.close()
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for ip, by_ttl in hops.items():
+        last = reached.get(ip, max(by_ttl) if by_ttl else 0)
+        path = []
+        for ttl in range(1, last + 1):
+            hop = by_ttl.get(ttl)
+            if hop is None:
+                hop = _hop(ttl)
+                if callback:
+                    try:
+                        callback(ip, hop)
+                    except Exception:
+                        pass
+            path.append(hop)
+        results[ip] = path
+    return results
+
+def _trace_cmd(ip: str, max_hops: int, timeout: float, callback=None) -> List[Dict[str, Any]]:
+    # Unprivileged fallback: stream the system tool's output line by line
+    if platform.system() == "Windows":
+        cmd = ["tracert", "-d", "-h", str(max_hops), "-w", str(int(timeout * 1000)), ip]
+        pattern = TRACE_WIN
+    else:
+        cmd = ["traceroute", "-n", "-q", "1", "-N", str(max_hops), "-m", str(max_hops),
+               "-w", str(max(1, int(timeout))), ip]
+        pattern = TRACE_UNIX
+    path: List[Dict[str, Any]] = []
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except Exception:
+        return path
+    for line in proc.stdout:
+        m = pattern.match(line)
+        if not m:
+            continue
+        rtt = m.group("rtt")
+        hop = _hop(int(m.group("ttl")), m.group("ip") or "*", float(rtt) if rtt else None)
+        path.append(hop)
+        if callback:
+            try:
+                callback(ip, hop)
+            except Exception:
+                pass
+    proc.wait()
+    return path
+
+def traceroute_many(hosts: List[str], max_hops: int = 30, timeout: float = 3.0,
+                    callback=None, use_cache: bool = True) -> Dict[str, List[Dict[str, Any]]]:
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    targets: Dict[str, str] = {}
+    now = time.monotonic()
+    for host in hosts:
+        with _trace_lock:
+            cached = _trace_cache.get(host)
+        if use_cache and cached and now - cached[0] < TRACE_CACHE_TTL:
+            results[host] = cached[1]
+            if callback:
+                for hop in cached[1]:
+                    try:
+                        callback(host, hop)
+                    except Exception:
+                        pass
+            continue
+        try:
+            targets[host] = socket.gethostbyname(host)
+        except Exception:
+            results[host] = []
+    if targets:
+        # Several names may resolve to one address; each of them gets the hops
+        by_ip: Dict[str, List[str]] = {}
+        for host, ip in targets.items():
+            by_ip.setdefault(ip, []).append(host)
+
+        def relay(ip: str, hop: Dict[str, Any]):
+            for host in by_ip.get(ip, [ip]):
+                callback(host, hop)
+
+        relay_cb = relay if callback else None
+        try:
+            traced = _trace_raw(targets, max_hops, timeout, relay_cb)
+        except OSError:
+            traced = {}
+            workers = [
+                threading.Thread(
+                    target=lambda ip=ip: traced.__setitem__(ip, _trace_cmd(ip, max_hops, timeout, relay_cb)),
+                    daemon=True,
+                )
+                for ip in by_ip
+            ]
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join()
+        stamp = time.monotonic()
+        for host, ip in targets.items():
+            results[host] = traced.get(ip, [])
+            # Empty paths (no tool, no replies) are not cached so a retry really retries
+            if results[host]:
+                with _trace_lock:
+                    _trace_cache[host] = (stamp, results[host])
+    return results
+
+def traceroute(host: str, max_hops: int = 30, timeout: float = 3.0,
+               callback=None, use_cache: bool = True) -> List[Dict[str, Any]]:
+    return traceroute_many([host], max_hops, timeout, callback, use_cache).get(host, [])
\ No newline at end of file
@@ -0,0 +1,177 @@
+# ---------- Imports ----------
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Persisted settings file
+CONFIG_PATH = Path.home() / ".network-monitor.json"
+
+# ---------- Watchlist ----------
+class Watchlist:
+    """Insertion-ordered set of IPs: O(1) membership, stable display order."""
+
+    def __init__(self, items: Iterable[str] = ()):
+        self._items: Dict[str, None] = dict.fromkeys(str(ip) for ip in items)
+
+    def __contains__(self, ip) -> bool:
+        return ip in self._items
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, ip: str):
+        self._items[str(ip)] = None
+
+    def discard(self, ip: str):
+        self._items.pop(ip, None)
+
+    remove = discard
+
+    def to_list(self):
+        return list(self._items)
+
+# ---------- Settings Store ----------
+class Settings(dict):
+    """Settings dict whose writes are debounced, done off-thread and atomic.
+
+    Mutate keys as usual, then call save(); bursts of saves inside the
+    debounce window collapse into a single write, and a steady stream of
+    saves is still written at least every `max_delay` seconds.
+    """
+
+    def __init__(self, defaults: Dict[str, Any], path: Path = CONFIG_PATH, debounce: float = 0.5,
+                 max_delay: float = 5.0):
+        super().__init__(defaults)
+        self.path = Path(path)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._closed = False
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self["watchlist"] = Watchlist(self.get("watchlist", ()))
+        self["nicknames"] = dict(self.get("nicknames", {}))
+        self.load()
+
+    # --- Loading ---
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return  # missing or malformed file
+        if not isinstance(data, dict):
+            return
+        for k, v in data.items():
+            if k not in self:
+                continue
+            if k == "watchlist":
+                v = Watchlist(v if isinstance(v, list) else ())
+            elif k == "nicknames":
+                v = {str(ip): str(n) for ip, n in v.items()} if isinstance(v, dict) else {}
+            self[k] = v
+
+    # --- Persistence ---
+    def save(self):
+        with self._cond:
+            if self._closed:
+                return
+            now = time.monotonic()
+            if not self._dirty:
+                self._first_change = now
+            self._dirty = True
+            self._last_change = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def close(self):
+        # Stop the writer, wait for an in-flight write, then always write the
+        # final state (covers keys changed without a save() call)
+        with self._cond:
+            self._closed = True
+            self._dirty = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._write()
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Coalesce: wait until no change has arrived for `debounce`
+                # seconds, but never hold a change back longer than `max_delay`
+                due = min(self._last_change + self.debounce, self._first_change + self.max_delay)
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._dirty = False
+            self._write()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        # dict()/list() copies run without releasing the GIL, so this is safe
+        # against concurrent mutation from the Tk thread
+        data = dict(self)
+        data["watchlist"] = self["watchlist"].to_list()
+        data["nicknames"] = dict(self["nicknames"])
+        return data
+
+    def _write(self):
+        # Snapshot under the lock so writes land in the order their data was taken
+        with self._write_lock:
+            data = self._snapshot()
+            try:
+                fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=str(self.path.parent))
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f, separators=(",", ":"))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+                except Exception:
+                    try: os.unlink(tmp)
+                    except OSError: pass
+                    raise
+            except Exception:
+                pass
+
+    # --- Nicknames ---
+    def import_nicknames(self, path, overwrite: bool = True) -> int:
+        """Merge a JSON ({ip: name}) or CSV/text (ip,name per line) file; returns entries applied."""
+        path = Path(path)
+        with open(path, "r", encoding="utf-8-sig") as f:
+            if path.suffix.lower() == ".json":
+                data = json.load(f)
+                pairs = data.items() if isinstance(data, dict) else ()
+            else:
+                pairs = ((row[0], row[1]) for row in csv.reader(f) if len(row) >= 2)
+            nicknames = self["nicknames"]
+            applied = 0
+            for ip, name in pairs:
+                ip, name = str(ip).strip(), str(name).strip()
+                if not ip or not name or ip.startswith("#") or ip.lower() == "ip":
+                    continue
+                if not overwrite and ip in nicknames:
+                    continue
+                nicknames[ip] = name
+                applied += 1
+        if applied:
+            self.save()
+        return applied
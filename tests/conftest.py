@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules live at the repo root (no package), so make them importable from tests/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,56 @@
+import threading
+
+from device import F_ALL, F_HISTORY, F_PING, F_STATUS, HISTORY_LEN, Device, Status, make_device
+
+def test_unchanged_writes_stay_clean():
+    dev = Device("10.0.0.1", "aa:bb:cc:dd:ee:ff")
+    assert dev.take_dirty() == F_ALL
+    dev.ping = None
+    dev.mac = "AA-BB-CC-DD-EE-FF"
+    assert dev.take_dirty() == 0
+    dev.ping = 1.5
+    assert dev.take_dirty() == F_PING
+
+def test_history_is_capped():
+    dev = Device("10.0.0.1")
+    for _ in range(HISTORY_LEN + 50):
+        dev.record(Status.ONLINE)
+    dev.record(Status.OFFLINE)
+    assert len(dev.history) == HISTORY_LEN
+    assert dev["history"][-1] == "Offline"
+    assert dev.take_dirty() & (F_HISTORY | F_STATUS) == F_HISTORY | F_STATUS
+    dev["history"] = ["Online"] * (HISTORY_LEN * 2)
+    assert len(dev.history) == HISTORY_LEN
+
+def test_names_fall_back_to_unpacked_host():
+    dev = make_device("printer.lan")
+    assert dev is not None
+    assert dev.host == "printer.lan" and dev.ip == "printer.lan" and dev.ip_int == 0
+    assert make_device("10.0.0.7").host == ""
+    assert make_device("  ") is None
+
+def test_only_dotted_quads_are_packed():
+    for key in ("127.1", "10", "10.0.0.1 junk"):
+        dev = make_device(key)
+        assert dev.ip_int == 0 and dev.ip == key
+
+def test_dirty_bits_survive_concurrent_take():
+    dev = Device("10.0.0.1")
+    dev.take_dirty()
+    seen = 0
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            dev.ping = float(i)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    for _ in range(2000):
+        seen |= dev.take_dirty()
+    stop.set()
+    t.join()
+    seen |= dev.take_dirty()
+    assert seen == F_PING
@@ -0,0 +1,182 @@
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import enrich
+from enrich import (DnsCache, Enricher, OuiIndex, ReverseResolver, build_oui_index, resolve_ptr,
+                    system_nameserver)
+
+OUI_SAMPLE = Path(__file__).resolve().parent.parent / "oui.txt"
+
+# ---------- Stub DNS server ----------
+@pytest.fixture
+def stub_dns():
+    """Answers PTR queries from a table; unknown names get NXDOMAIN."""
+    names = {"1.0.0.10.in-addr.arpa": "router.lan", "2.0.0.10.in-addr.arpa": "nas.lan"}
+    queries = []
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.2)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                query, addr = sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            end = query.index(b"\x00", 12)
+            qname, labels, pos = query[12:end + 5], [], 12
+            while query[pos]:
+                labels.append(query[pos + 1:pos + 1 + query[pos]].decode())
+                pos += 1 + query[pos]
+            name = ".".join(labels)
+            queries.append(name)
+            target = names.get(name)
+            if target is None:
+                sock.sendto(query[:2] + struct.pack("!HHHHH", 0x8183, 1, 0, 0, 0) + qname, addr)
+                continue
+            rdata = b"".join(bytes([len(l)]) + l.encode() for l in target.split(".")) + b"\x00"
+            answer = b"\xc0\x0c" + struct.pack("!HHIH", 12, 1, 60, len(rdata)) + rdata
+            sock.sendto(query[:2] + struct.pack("!HHHHH", 0x8180, 1, 1, 0, 0) + qname + answer, addr)
+
+    t = threading.Thread(target=serve, daemon=True)
+    t.start()
+    yield sock.getsockname(), queries
+    stop.set()
+    t.join()
+    sock.close()
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+# ---------- Reverse DNS ----------
+def test_resolve_ptr_against_stub(stub_dns):
+    server, _ = stub_dns
+    assert resolve_ptr("10.0.0.1", server) == "router.lan"
+    assert resolve_ptr("10.0.0.99", server) is None
+
+def test_resolve_ptr_skips_truncated_replies(stub_dns):
+    server, _ = stub_dns
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+
+    def relay():
+        # Two runts (short header, header only) ahead of the real answer
+        query, client = sock.recvfrom(512)
+        sock.sendto(b"\x00\x01\x02\x03", client)
+        sock.sendto(query[:2] + b"\x81\x80\x00\x01\x00\x01\x00\x00\x00\x00\xc0", client)
+        upstream = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        upstream.settimeout(2.0)
+        upstream.sendto(query, server)
+        sock.sendto(upstream.recv(512), client)
+        upstream.close()
+
+    t = threading.Thread(target=relay, daemon=True)
+    t.start()
+    assert resolve_ptr("10.0.0.1", sock.getsockname(), timeout=2.0) == "router.lan"
+    t.join()
+    sock.close()
+
+def test_default_path_uses_system_nameserver(stub_dns, monkeypatch):
+    server, queries = stub_dns
+    monkeypatch.setattr(enrich, "system_nameserver", lambda: server)
+    assert resolve_ptr("10.0.0.2") == "nas.lan"
+    assert ReverseResolver(DnsCache(None)).server == server
+    assert queries == ["2.0.0.10.in-addr.arpa"]
+
+def test_default_path_enforces_timeout(monkeypatch):
+    # No nameserver configured: the system resolver is cut off after `timeout`
+    monkeypatch.setattr(enrich, "system_nameserver", lambda: None)
+    monkeypatch.setattr(socket, "gethostbyaddr", lambda ip: time.sleep(5))
+    started = time.monotonic()
+    with pytest.raises(socket.timeout):
+        resolve_ptr("10.0.0.1", timeout=0.2)
+    assert time.monotonic() - started < 1.0
+
+def test_system_nameserver_reads_resolv_conf(tmp_path):
+    conf = tmp_path / "resolv.conf"
+    conf.write_text("# generated\nsearch lan\nnameserver fe80::1\nnameserver 192.168.1.1\nnameserver 9.9.9.9\n")
+    assert system_nameserver(conf) == ("192.168.1.1", 53)
+    assert system_nameserver(tmp_path / "missing") is None
+
+def test_resolver_caches_hits_and_misses(stub_dns, tmp_path):
+    server, queries = stub_dns
+    cache = DnsCache(tmp_path / "dns.json")
+    resolver = ReverseResolver(cache, server=server, workers=2, timeout=0.5)
+    results = {}
+    for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.99"):
+        assert resolver.lookup(ip, lambda ip, name: results.__setitem__(ip, name)) is None
+    assert _wait_for(lambda: len(results) == 3)
+    assert results == {"10.0.0.1": "router.lan", "10.0.0.2": "nas.lan", "10.0.0.99": ""}
+
+    # Second round is answered from the cache without touching the server
+    sent = len(queries)
+    assert resolver.lookup("10.0.0.1") == "router.lan"
+    assert resolver.lookup("10.0.0.99") == ""
+    assert len(queries) == sent
+
+    cache.save()
+    reloaded = DnsCache(tmp_path / "dns.json")
+    assert reloaded.get("10.0.0.2") == "nas.lan"
+    assert reloaded.get("10.0.0.99") == ""
+
+def test_negative_entries_expire(tmp_path):
+    cache = DnsCache(tmp_path / "dns.json", negative_ttl=-1)
+    cache.put("10.0.0.5", None)
+    assert cache.get("10.0.0.5") is None
+
+# ---------- OUI index ----------
+def test_oui_index_against_sample(tmp_path):
+    oui = OuiIndex(OUI_SAMPLE, tmp_path / "oui.idx")
+    assert oui.warm().join() is None
+    assert oui.lookup("b8:27:eb:12:34:56") == "Raspberry Pi Foundation"
+    assert oui.lookup("00-50-56-aa-bb-cc") == "VMware, Inc."
+    assert oui.lookup("00:00:0c:01:02:03") == "Cisco Systems, Inc"  # first record
+    assert oui.lookup("dc:a6:32:00:00:01") == "Raspberry Pi Trading Ltd"  # last record
+    assert oui.lookup("ff:ff:ff:00:00:00") == ""
+    assert oui.lookup("") == ""
+
+def test_oui_lookup_does_not_block_before_warm(tmp_path):
+    oui = OuiIndex(OUI_SAMPLE, tmp_path / "oui.idx")
+    assert oui.lookup("b8:27:eb:12:34:56") == ""
+    oui.warm().join()
+    assert oui.lookup("b8:27:eb:12:34:56") == "Raspberry Pi Foundation"
+
+def test_oui_ignores_address_lines(tmp_path):
+    source = tmp_path / "oui.txt"
+    source.write_text(
+        "AC-DE-48   (hex)\t\tExample Corp\n"
+        "ACDE48     (base 16)\t\tExample Corp\n"
+        "\t\t\t\t123456 Industrial Way\n"
+        "123456     Some Street\n"
+    )
+    build_oui_index(source, tmp_path / "oui.idx")
+    oui = OuiIndex(source, tmp_path / "oui.idx")
+    oui.warm().join()
+    assert oui.lookup("ac:de:48:00:00:01") == "Example Corp"
+    assert oui.lookup("12:34:56:00:00:01") == ""
+
+# ---------- Enrichment stage ----------
+def test_enricher_fills_vendor_and_streams_hostnames(stub_dns, tmp_path):
+    server, _ = stub_dns
+    oui = OuiIndex(OUI_SAMPLE, tmp_path / "oui.idx")
+    oui.warm().join()
+    enricher = Enricher(ReverseResolver(DnsCache(None), server=server, timeout=0.5), oui)
+    devices = {"10.0.0.1": {"mac": "b8:27:eb:00:00:01"}, "10.0.0.99": {"mac": ""}}
+    updated = []
+    enricher.enrich(devices, callback=lambda ip, info: updated.append(ip))
+    assert devices["10.0.0.1"]["vendor"] == "Raspberry Pi Foundation"
+    assert _wait_for(lambda: updated == ["10.0.0.1"])
+    assert devices["10.0.0.1"]["hostname"] == "router.lan"
+    assert devices["10.0.0.99"]["hostname"] == ""
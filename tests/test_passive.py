@@ -0,0 +1,60 @@
+import struct
+from pathlib import Path
+
+from passive import PassiveListener, PcapSource, parse_frame
+
+SAMPLE_PCAP = Path(__file__).resolve().parent / "fixtures" / "sample.pcap"
+
+def _replay(path):
+    sightings, errors = [], []
+    listener = PassiveListener(PcapSource(str(path)), lambda *s: sightings.append(s), on_error=errors.append)
+    listener.run()
+    return listener, sightings, errors
+
+# ---------- Pcap replay ----------
+def test_replay_sample_capture():
+    # ARP reply, ARP probe, VLAN-tagged ARP, DHCP REQUEST, DHCP ACK, DHCP DISCOVER, TCP, runt
+    listener, sightings, errors = _replay(SAMPLE_PCAP)
+    assert errors == []
+    assert listener.frames == 8
+    assert listener.sightings == 4
+    assert [(ip, mac, name, src) for ip, mac, name, src, _ts in sightings] == [
+        ("192.168.1.1", "aa:bb:cc:00:00:01", "", "arp"),
+        ("192.168.1.20", "b8:27:eb:00:00:20", "", "arp"),
+        ("192.168.1.30", "dc:a6:32:00:00:30", "laptop", "dhcp"),
+        ("192.168.1.31", "00:50:56:00:00:31", "", "dhcp"),
+    ]
+    assert sightings[0][4] == 1700000000.0
+
+def test_callback_errors_do_not_stop_capture():
+    seen = []
+
+    def flaky(ip, *rest):
+        seen.append(ip)
+        raise RuntimeError("consumer bug")
+
+    listener = PassiveListener(PcapSource(str(SAMPLE_PCAP)), flaky)
+    listener.run()
+    assert len(seen) == 4
+
+# ---------- Failures ----------
+def test_source_failure_reaches_on_error(tmp_path):
+    bogus = tmp_path / "not.pcap"
+    bogus.write_bytes(b"\x00" * 24)
+    listener, sightings, errors = _replay(bogus)
+    assert sightings == []
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+def test_short_frames_are_ignored():
+    assert parse_frame(b"\xff" * 10, 10, 0.0) is None
+
+def test_arp_must_be_ethernet_ipv4():
+    def arp(htype, ptype):
+        frame = b"\xff" * 6 + b"\xaa\xbb\xcc\x00\x00\x01" + b"\x08\x06"
+        frame += struct.pack("!HHBBH", htype, ptype, 6, 4, 2)
+        frame += b"\xaa\xbb\xcc\x00\x00\x01" + bytes([10, 0, 0, 1]) + b"\x00" * 6 + bytes([10, 0, 0, 2])
+        return frame
+
+    assert parse_frame(arp(1, 0x0800), 42, 0.0)[:2] == ("10.0.0.1", "aa:bb:cc:00:00:01")
+    assert parse_frame(arp(1, 0x86DD), 42, 0.0) is None
+    assert parse_frame(arp(0x0101, 0x0800), 42, 0.0) is None
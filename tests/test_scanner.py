@@ -0,0 +1,173 @@
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+import scanner
+from device import Device, Status, make_device
+from scanner import (DEGRADED_LOSS, TRACE_UNIX, TRACE_WIN, PingStats, _apply_stats, _next_echo_ident,
+                     _parse_trace_reply, _trace_cmd, status_from_loss)
+
+# ---------- Traceroute ----------
+def _icmp_error(icmp_type, dst, sport, dport, proto=socket.IPPROTO_UDP):
+    # Outer IPv4 header + ICMP header quoting our probe's IPv4 + UDP headers
+    quoted = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 28, 0, 0, 1, proto, 0,
+                         socket.inet_aton("10.0.0.2"), socket.inet_aton(dst))
+    quoted += struct.pack("!HHHH", sport, dport, 8, 0)
+    icmp = struct.pack("!BBHI", icmp_type, 0, 0, 0) + quoted
+    outer = struct.pack("!BBHHHBBH4s4s", 0x45, 0, 20 + len(icmp), 0, 0, 64, socket.IPPROTO_ICMP, 0,
+                        socket.inet_aton("192.168.1.1"), socket.inet_aton("10.0.0.2"))
+    return outer + icmp
+
+def test_parse_trace_reply_recovers_quoted_probe():
+    assert _parse_trace_reply(_icmp_error(11, "8.8.8.8", 40000, 33437)) == (11, "8.8.8.8", 40000, 33437)
+    assert _parse_trace_reply(_icmp_error(3, "8.8.8.8", 40000, 33440)) == (3, "8.8.8.8", 40000, 33440)
+
+def test_parse_trace_reply_ignores_other_packets():
+    assert _parse_trace_reply(_icmp_error(11, "8.8.8.8", 40000, 33437, proto=socket.IPPROTO_TCP)) is None
+    echo_reply = _icmp_error(0, "8.8.8.8", 40000, 33437)
+    assert _parse_trace_reply(echo_reply) is None
+    assert _parse_trace_reply(_icmp_error(11, "8.8.8.8", 40000, 33437)[:40]) is None
+    assert _parse_trace_reply(b"") is None
+
+def test_trace_patterns():
+    m = TRACE_UNIX.match(" 3  10.1.2.3  12.345 ms")
+    assert (m.group("ttl"), m.group("ip"), m.group("rtt")) == ("3", "10.1.2.3", "12.345")
+    m = TRACE_UNIX.match(" 4  *")
+    assert (m.group("ttl"), m.group("ip"), m.group("rtt")) == ("4", "*", None)
+    assert TRACE_UNIX.match("traceroute to 8.8.8.8 (8.8.8.8), 30 hops max") is None
+
+    m = TRACE_WIN.match("  1    <1 ms    <1 ms    <1 ms  192.168.1.1")
+    assert (m.group("ttl"), m.group("ip"), m.group("rtt")) == ("1", "192.168.1.1", "1")
+    m = TRACE_WIN.match("  2     *        *        *     Request timed out.")
+    assert (m.group("ttl"), m.group("ip")) == ("2", None)
+    assert TRACE_WIN.match("Tracing route to 8.8.8.8 over a maximum of 30 hops") is None
+
+def test_trace_cmd_streams_parsed_hops(monkeypatch):
+    output = [
+        "traceroute to 10.9.9.9 (10.9.9.9), 3 hops max, 60 byte packets\n",
+        " 1  192.168.1.1  0.512 ms\n",
+        " 2  *\n",
+        " 3  10.9.9.9  8.1 ms\n",
+    ]
+
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            self.stdout = iter(output)
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(scanner.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(scanner.subprocess, "Popen", FakePopen)
+    streamed = []
+    path = _trace_cmd("10.9.9.9", 3, 1.0, lambda ip, hop: streamed.append((ip, hop["ttl"])))
+    assert path == [
+        {"ttl": 1, "ip": "192.168.1.1", "rtt": 0.512},
+        {"ttl": 2, "ip": "*", "rtt": None},
+        {"ttl": 3, "ip": "10.9.9.9", "rtt": 8.1},
+    ]
+    assert streamed == [("10.9.9.9", 1), ("10.9.9.9", 2), ("10.9.9.9", 3)]
+# ---------- Loss / jitter ----------
+def test_ping_stats_burst():
+    stats = PingStats()
+    for rtt in [10, None, 12, 11, None]:
+        stats.add(rtt)
+    assert (stats.sent, stats.received) == (5, 3)
+    assert stats.loss == pytest.approx(40.0)
+    assert stats.avg == pytest.approx(11.0)
+    assert (stats.min, stats.max) == (10, 12)
+    assert stats.mdev == pytest.approx(0.816, abs=1e-3)
+    assert stats.jitter == pytest.approx(1.5)
+    assert status_from_loss(stats.loss) == Status.DEGRADED
+
+def test_status_from_loss_thresholds():
+    assert status_from_loss(0.0) == Status.ONLINE
+    assert status_from_loss(DEGRADED_LOSS - 0.1) == Status.ONLINE
+    assert status_from_loss(DEGRADED_LOSS) == Status.DEGRADED
+    assert status_from_loss(100.0) == Status.OFFLINE
+    assert PingStats().loss == 100.0
+
+def test_apply_stats_fills_device():
+    stats = PingStats()
+    for rtt in [10, None, 12, 11, None]:
+        stats.add(rtt)
+    dev = Device("10.0.0.1")
+    _apply_stats(dev, stats)
+    assert (dev.loss, dev.ping, dev.rtt_min, dev.rtt_max, dev.jitter) == (40.0, 11.0, 10, 12, 1.5)
+    assert dev["status"] == "Degraded" and dev["history"] == ["Degraded"]
+
+def test_concurrent_bursts_use_distinct_idents():
+    assert len({_next_echo_ident() for _ in range(100)}) == 100
+
+def _run_measure(monkeypatch, devices, raw):
+    cmd_hosts, raw_hosts = [], []
+
+    def fake_cmd(ip, count, interval, timeout):
+        cmd_hosts.append(ip)
+        return PingStats()
+
+    monkeypatch.setattr(scanner, "_measure_cmd", fake_cmd)
+    monkeypatch.setattr(scanner, "_measure_raw", lambda hosts, *a: (raw_hosts.extend(hosts), raw(hosts, *a)))
+    monkeypatch.setattr(scanner, "detect_protocol", lambda ip: "TCP")
+    reported = []
+    lock = threading.Lock()
+
+    def callback(ip, info):
+        with lock:
+            reported.append(ip)
+
+    scanner.measure_network(devices, count=1, callback=callback).join()
+    deadline = time.monotonic() + 2.0
+    while len(reported) < len(devices) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return sorted(raw_hosts), sorted(cmd_hosts), sorted(reported)
+
+def test_measure_sends_names_to_system_ping(monkeypatch):
+    devices = {ip: make_device(ip) for ip in ("10.0.0.1", "10.0.0.2", "printer.lan")}
+
+    def raw(hosts, count, interval, timeout, on_done):
+        for ip in hosts:
+            stats = PingStats()
+            stats.add(1.0)
+            on_done(ip, stats)
+
+    raw_hosts, cmd_hosts, reported = _run_measure(monkeypatch, devices, raw)
+    assert raw_hosts == ["10.0.0.1", "10.0.0.2"]
+    assert cmd_hosts == ["printer.lan"]
+    assert reported == ["10.0.0.1", "10.0.0.2", "printer.lan"]
+
+def test_measure_falls_back_only_for_unfinished_hosts(monkeypatch):
+    devices = {ip: make_device(ip) for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3")}
+
+    def raw(hosts, count, interval, timeout, on_done):
+        on_done(hosts[0], PingStats())
+        raise OSError("socket went away")
+
+    raw_hosts, cmd_hosts, reported = _run_measure(monkeypatch, devices, raw)
+    assert cmd_hosts == ["10.0.0.2", "10.0.0.3"]
+    assert reported == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert devices["10.0.0.1"]["history"] == ["Offline"]
+# ---------- Single ping ----------
+def test_single_ping_clears_burst_figures(monkeypatch):
+    dev = Device("10.0.0.1")
+    stats = PingStats()
+    for rtt in [1, None, 3]:
+        stats.add(rtt)
+    _apply_stats(dev, stats)
+    dev.protocol = "HTTP"
+
+    monkeypatch.setattr(scanner, "ping", lambda ip: 50.0)
+    monkeypatch.setattr(scanner, "detect_protocol", lambda ip: "TCP")
+    for t in scanner.threaded_ping({"10.0.0.1": dev}):
+        t.join()
+    assert (dev.ping, dev.loss, dev.jitter) == (50.0, None, None)
+    assert (dev.rtt_min, dev.rtt_max, dev.rtt_mdev) == (None, None, None)
+    assert dev["status"] == "Online" and dev.protocol == "TCP"
+
+    monkeypatch.setattr(scanner, "ping", lambda ip: None)
+    for t in scanner.threaded_ping({"10.0.0.1": dev}):
+        t.join()
+    assert dev["status"] == "Offline" and dev.protocol == ""
\ No newline at end of file
@@ -0,0 +1,79 @@
+import json
+import time
+
+from settings import Settings, Watchlist
+
+def test_close_writes_unsaved_changes(tmp_path):
+    path = tmp_path / "config.json"
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=path)
+    s["theme"] = "Light"  # no save() call
+    s.close()
+    assert json.loads(path.read_text())["theme"] == "Light"
+
+def test_close_waits_for_writer(tmp_path):
+    path = tmp_path / "config.json"
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=path, debounce=0.05)
+    for i in range(50):
+        s["nicknames"][f"10.0.0.{i}"] = f"host{i}"
+        s.save()
+    s.close()
+    assert len(json.loads(path.read_text())["nicknames"]) == 50
+    # Nothing written after close() returns
+    stamp = path.stat().st_mtime_ns
+    s["theme"] = "Light"
+    s.save()
+    time.sleep(0.2)
+    assert path.stat().st_mtime_ns == stamp
+    assert json.loads(path.read_text())["theme"] == "Dark"
+
+def test_max_delay_bounds_debounce(tmp_path):
+    path = tmp_path / "config.json"
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=path, debounce=0.2, max_delay=0.3)
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline and not path.exists():
+        s["theme"] = str(time.monotonic())
+        s.save()
+        time.sleep(0.02)
+    assert path.exists()
+    s.close()
+
+def test_load_round_trip(tmp_path):
+    path = tmp_path / "config.json"
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=path)
+    s["watchlist"].add("10.0.0.5")
+    s["nicknames"]["10.0.0.5"] = "printer"
+    s.close()
+    again = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=path)
+    assert isinstance(again["watchlist"], Watchlist)
+    assert again["watchlist"].to_list() == ["10.0.0.5"]
+    assert again["nicknames"] == {"10.0.0.5": "printer"}
+    again.close()
+
+# ---------- Nickname import ----------
+def test_import_nicknames_csv(tmp_path):
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {"10.0.0.1": "router"}},
+                 path=tmp_path / "config.json")
+    source = tmp_path / "names.csv"
+    source.write_text(
+        "ip,name\n"
+        "# exported from the router\n"
+        "10.0.0.1, gateway\n"
+        "10.0.0.2,nas\n"
+        ",missing ip\n"
+        "10.0.0.3\n",
+        encoding="utf-8",
+    )
+    assert s.import_nicknames(source, overwrite=False) == 1
+    assert s["nicknames"] == {"10.0.0.1": "router", "10.0.0.2": "nas"}
+    assert s.import_nicknames(source) == 2
+    assert s["nicknames"]["10.0.0.1"] == "gateway"
+    s.close()
+    assert json.loads((tmp_path / "config.json").read_text())["nicknames"]["10.0.0.1"] == "gateway"
+
+def test_import_nicknames_json(tmp_path):
+    s = Settings({"theme": "Dark", "watchlist": [], "nicknames": {}}, path=tmp_path / "config.json")
+    source = tmp_path / "names.json"
+    source.write_text(json.dumps({"10.0.0.5": "printer", "10.0.0.6": ""}), encoding="utf-8")
+    assert s.import_nicknames(source) == 1
+    assert s["nicknames"] == {"10.0.0.5": "printer"}
+    s.close()